@@ -10,7 +10,11 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
-import bpy
+try:
+    import bpy
+except ImportError:
+    # Running outside of Blender, only Blender-independent parts (like converter) are available
+    bpy = None
 
 bl_info = {
     "name": "glTF Supercell IO",
@@ -23,19 +27,20 @@ bl_info = {
     "category": "Generic",
 }
 
-from .importer.ui import glTFSupercellImporterProperties
-from .importer.importer_patch import patch_importer
-from .com.shader.builder import ShaderBuilder
+if bpy is not None:
+    from .importer.ui import glTFSupercellImporterProperties
+    from .importer.importer_patch import patch_importer
+    from .com.shader.builder import ShaderBuilder
 
-# Initialization functions for glTF importer extension
-from .importer.ui import draw_import
-from .importer import glTF2ImportUserExtension
+    # Initialization functions for glTF importer extension
+    from .importer.ui import draw_import
+    from .importer import glTF2ImportUserExtension
 
-def register():
-    bpy.utils.register_class(glTFSupercellImporterProperties)
-    bpy.types.Scene.glTFSupercellImporterProperties = bpy.props.PointerProperty(type=glTFSupercellImporterProperties)
-    patch_importer()
+    def register():
+        bpy.utils.register_class(glTFSupercellImporterProperties)
+        bpy.types.Scene.glTFSupercellImporterProperties = bpy.props.PointerProperty(type=glTFSupercellImporterProperties)
+        patch_importer()
 
-def unregister():
-    bpy.utils.unregister_class(glTFSupercellImporterProperties)
-    del bpy.types.Scene.glTFSupercellImporterProperties
\ No newline at end of file
+    def unregister():
+        bpy.utils.unregister_class(glTFSupercellImporterProperties)
+        del bpy.types.Scene.glTFSupercellImporterProperties
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Batch import of Supercell glTF files into .blend files.
+
+Usage:
+    blender --background --python gltf_supercell_io/batch.py -- [options] <files or directories>
+
+Files are sharded across worker processes, each worker is a single Blender session
+with add-on registered and shader library loaded once, so every next file is imported in a warm session.
+
+Options:
+    --output DIR        Directory for .blend files. By default files are saved next to source files
+    --jobs N            Count of worker processes. Defaults to count of CPU cores
+    --file-list FILE    Text file with list of files to import, one per line
+"""
+import bpy
+import addon_utils
+import argparse
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import traceback
+
+GLTF_EXTENSIONS = (".glb", ".gltf")
+
+
+def parse_arguments(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="batch.py", description="Batch import of Supercell glTF files")
+    parser.add_argument("inputs", nargs="*", help="Files or directories to import")
+    parser.add_argument("--output", help="Output directory for .blend files")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Count of worker processes")
+    parser.add_argument("--file-list", help="Text file with list of files to import")
+
+    # Internal: list of tab separated source and output paths processed by worker
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+
+    return parser.parse_args(argv)
+
+
+def script_arguments() -> list[str]:
+    """Arguments passed after `--` to Blender"""
+    if "--" not in sys.argv:
+        return []
+
+    return sys.argv[sys.argv.index("--") + 1:]
+
+
+def collect_tasks(args: argparse.Namespace) -> list[tuple[str, str]]:
+    """Returns list of source files and their output paths"""
+    sources: list[tuple[pathlib.Path, pathlib.Path]] = []
+
+    inputs = list(args.inputs)
+    if args.file_list:
+        with open(args.file_list, "r", encoding="utf8") as file:
+            inputs.extend(line.strip() for line in file if line.strip())
+
+    for path in inputs:
+        path = pathlib.Path(path)
+        if path.is_dir():
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(GLTF_EXTENSIONS):
+                        sources.append((pathlib.Path(root, name), path))
+        elif path.is_file():
+            sources.append((path, path.parent))
+        else:
+            print(f"[SC IO] Skipping missing input: {path}")
+
+    tasks = []
+    for source, base in sources:
+        if args.output:
+            target = pathlib.Path(args.output, source.relative_to(base))
+        else:
+            target = source
+
+        tasks.append((str(source), str(target.with_suffix(".blend"))))
+
+    return tasks
+
+
+def enable_addon():
+    """
+    Makes sure that this add-on is registered in current session.
+    Script may be run from a repository checkout, so installed add-on is found by its package name instead of its location
+    """
+    package = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
+
+    for module in addon_utils.modules():
+        # Extensions are registered under `bl_ext.<repository>.<id>`, legacy add-ons under their package name
+        if module.__name__.rpartition(".")[2] != package:
+            continue
+
+        is_enabled, is_loaded = addon_utils.check(module.__name__)
+        if not is_loaded:
+            addon_utils.enable(module.__name__, default_set=True)
+        return
+
+    raise RuntimeError("Supercell IO add-on is not installed in this Blender")
+
+
+def import_file(source: str, target: str):
+    # Fresh empty file, add-ons and already loaded modules stay in session
+    bpy.ops.wm.read_homefile(use_empty=True)
+
+    bpy.ops.import_scene.gltf(filepath=source)
+
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    bpy.ops.wm.save_as_mainfile(filepath=target, check_existing=False)
+
+
+def run_worker(tasks: list[tuple[str, str]]) -> int:
+    enable_addon()
+
+    failed = 0
+    for i, (source, target) in enumerate(tasks):
+        print(f"[SC IO] [{i + 1}/{len(tasks)}] {source}")
+        try:
+            import_file(source, target)
+        except Exception:
+            traceback.print_exc()
+            print(f"[SC IO] Failed to import {source}")
+            failed += 1
+
+    return failed
+
+
+def write_task_list(tasks: list[tuple[str, str]]) -> str:
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf8") as file:
+        for source, target in tasks:
+            file.write(f"{source}\t{target}\n")
+
+        return file.name
+
+
+def read_task_list(path: str) -> list[tuple[str, str]]:
+    with open(path, "r", encoding="utf8") as file:
+        return [tuple(line.rstrip("\n").split("\t")) for line in file if line.strip()]
+
+
+def run_pool(tasks: list[tuple[str, str]], jobs: int) -> int:
+    """Shards tasks across worker Blender processes and waits for all of them"""
+    jobs = max(1, min(jobs, len(tasks)))
+    if jobs == 1:
+        return run_worker(tasks)
+
+    shards = [tasks[i::jobs] for i in range(jobs)]
+    task_lists = [write_task_list(shard) for shard in shards]
+
+    try:
+        processes = [
+            subprocess.Popen([
+                bpy.app.binary_path, "--background", "--python-exit-code", "1",
+                "--python", os.path.abspath(__file__), "--", "--worker", task_list
+            ])
+            for task_list in task_lists
+        ]
+
+        return sum(1 for process in processes if process.wait() != 0)
+    finally:
+        for task_list in task_lists:
+            os.remove(task_list)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_arguments(argv)
+
+    if args.worker:
+        failed = run_worker(read_task_list(args.worker))
+        return 1 if failed else 0
+
+    tasks = collect_tasks(args)
+    if not tasks:
+        print("[SC IO] Nothing to import")
+        return 0
+
+    failed = run_pool(tasks, args.jobs)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(script_arguments()))
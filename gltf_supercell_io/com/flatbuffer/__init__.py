@@ -2,6 +2,10 @@ from flatbuffers import flexbuffers, Builder
 from enum import IntEnum
 import numpy as np
 from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
 
 import importlib.util
 import sys
@@ -314,6 +318,10 @@ def preprocess_data(data: any, clean: bool = False) -> any:
         if clean and len(data.keys()) == 0:
             return None
         return preprocess_dict(data)
+    elif isinstance(data, np.ndarray):
+        if clean and len(data) == 0:
+            return None
+        return preprocess_array(data)
     elif isinstance(data, float):
         return round(data, 6)
     elif isinstance(data, int):
@@ -345,6 +353,23 @@ def preprocess_list(data: list) -> list:
     return result
 
 
+def preprocess_array(data: np.ndarray) -> np.ndarray:
+    """
+    Vectorized version of `preprocess_list` for numeric numpy arrays.
+    Floats are rounded and -1 values are removed from integer arrays.
+
+    :param data: Numeric numpy array
+    :type data: np.ndarray
+    :return: preprocessed array.
+    """
+    if np.issubdtype(data.dtype, np.floating):
+        return normalize_float_ndarray(data)
+    elif np.issubdtype(data.dtype, np.integer):
+        return normalize_int_ndarray(data)
+
+    return data
+
+
 def preprocess_dict(data: dict) -> dict:
     """
     The function preprocesses a dictionary by removing any key-value pairs where the value is None and
@@ -367,6 +392,31 @@ def preprocess_dict(data: dict) -> dict:
     return result
 
 
+def clean_data(data: any) -> any:
+    """
+    Removes empty arrays and dictionaries from deserialized data.
+    Decoded dictionaries may be shared, so cleaned copies are returned instead of modifying them
+
+    :param data: Deserialized data
+    :return: Cleaned data, None if data itself is empty
+    """
+    if isinstance(data, list):
+        result = [value for value in map(clean_data, data) if value is not None]
+        return result or None
+    elif isinstance(data, dict):
+        result = OrderedDict()
+        for key, value in data.items():
+            value = clean_data(value)
+            if value is not None:
+                result[key] = value
+
+        return result or None
+    elif isinstance(data, np.ndarray):
+        return data if len(data) else None
+
+    return data
+
+
 def deserialize_string(data: bytes | None) -> str:
     if data is None:
         return None
@@ -378,112 +428,442 @@ def deserialize_flexbuffer(data: np.ndarray) -> any:
     if isinstance(data, int) and data == 0:
         return None
 
-    data_array = bytearray(data)
+    data_array = data if isinstance(data, (bytes, bytearray)) else bytearray(data)
     try:
         return flexbuffers.Loads(data_array)
     except:
         pass
 
 
-def deserialize_array(buffer: any, key: str, schema: any) -> list:
-    # List of numbers
-    if schema == int or schema == float:
-        number_array = getattr(buffer, f"{key}AsNumpy")()
-        if isinstance(number_array, int) and number_array == 0:
-            return None
-        return number_array.tolist()
+def load_flexbuffer(data: np.ndarray) -> any:
+    """
+    Decodes and preprocesses FlexBuffer payload.
+    Uses cache of currently deserialized file if there is one
+    """
+    if isinstance(data, int) and data == 0:
+        return None
 
-    # Structs | strings
-    elif isinstance(schema, dict) or schema == str:
-        object_number = getattr(buffer, f"{key}Length")()
-        if (object_number == 0):
-            return None
+    cache = FlexBufferCache.current.get()
+    if cache is None:
+        return preprocess_data(deserialize_flexbuffer(data))
 
-        result = []
-        for i in range(object_number):
-            object_buffer = getattr(buffer, key)(i)
-            if (schema == str):
-                result.append(bytes(object_buffer).decode('utf8'))
-            else:
-                result.append(deserialize_flatbuffer(object_buffer, schema))
-            
-        return result
+    return cache.load(data.tobytes())
 
 
-def deserialize_flatbuffer(buffer: any, schema: dict, clean: bool = False) -> dict:
-    result = OrderedDict()
+# Marker for field values which should not be written to result at all
+SKIP = object()
 
-    for key, value in schema.items():
-        if (key.startswith("_")):
-            continue
-        
-        getter_key = pascal_case(key)
-        value_type = value
-        default_value = None
-        value_data = None
 
-        if (isinstance(value_type, tuple)):
-            value_type, default_value = value
+def normalize_int(value: int) -> int | None:
+    return None if value == -1 else value
+
+
+def normalize_float(value: float) -> float:
+    return round(value, 6)
+
 
+def normalize_int_array(data: np.ndarray) -> list:
+    return data[data != -1].tolist()
+
+
+def normalize_float_array(data: np.ndarray) -> list:
+    return normalize_float_ndarray(data).tolist()
+
+
+def normalize_int_ndarray(data: np.ndarray) -> np.ndarray:
+    return data[data != -1]
+
+
+def normalize_float_ndarray(data: np.ndarray) -> np.ndarray:
+    return np.round(data.astype(np.float64), 6)
+
+
+class SchemaDecoder:
+    """
+    Schema compiled into specialized readers for single table type.
+    All flatbuffer getters, keys and defaults are resolved once, so decoding does not use reflection.
+    Values are preprocessed right at decoding (same way as `preprocess_data` does), so result is ready to use.
+    With `numpy_arrays` numeric vectors are kept as numpy arrays instead of lists
+    """
+
+    # Compiled decoders by schema object id and mode. Schemas are kept alive by decoders, so ids are stable
+    compiled: dict[tuple[int, bool], "SchemaDecoder"] = {}
+
+    @classmethod
+    def get(cls, schema: dict, numpy_arrays: bool = False) -> "SchemaDecoder":
+        key = (id(schema), numpy_arrays)
+        decoder = cls.compiled.get(key)
+        if decoder is None:
+            decoder = cls(schema, numpy_arrays)
+            cls.compiled[key] = decoder
+
+        return decoder
+
+    def __init__(self, schema: dict, numpy_arrays: bool = False):
+        self.schema = schema
+        self.table = schema.get("_type")
+        self.numpy_arrays = numpy_arrays
+
+        # List of (key, reader, normalizer, default value)
+        self.fields: list[tuple[str, Callable[[any], any], Callable[[any], any] | None, any]] = []
+        for key, value in schema.items():
+            if (key.startswith("_")):
+                continue
+
+            value_type = value
+            default_value = None
+            if (isinstance(value_type, tuple)):
+                value_type, default_value = value
+
+            reader, normalizer = self.compile_field(pascal_case(key), value_type, default_value)
+            self.fields.append((key, reader, normalizer, default_value))
+
+        self.indices = {field[0]: i for i, field in enumerate(self.fields)}
+
+    def compile_field(self, getter_key: str, value_type: any, default_value: any) -> tuple[Callable[[any], any], Callable[[any], any] | None]:
+        """Returns reader of raw field value and normalizer which preprocesses that value"""
         # Numbers & Booleans | Simple Types
-        if value_type == int or value_type == bool or value_type == float:
-            value_data = getattr(buffer, getter_key)()
+        if value_type == int:
+            return getattr(self.table, getter_key), normalize_int
+
+        elif value_type == float:
+            return getattr(self.table, getter_key), normalize_float
+
+        elif value_type == bool:
+            return getattr(self.table, getter_key), None
 
         # Strings
         elif value_type == str:
-            value_data = deserialize_string(getattr(buffer, getter_key)())
+            getter = getattr(self.table, getter_key)
+            return lambda buffer: deserialize_string(getter(buffer)), None
 
         # FlexBuffers
         elif value_type == bytes:
-            value_data = deserialize_flexbuffer(
-                getattr(buffer, f"{getter_key}AsNumpy")()
-            )
+            getter = getattr(self.table, f"{getter_key}AsNumpy")
+            return lambda buffer: load_flexbuffer(getter(buffer)), None
 
         # Array Of Objects
         elif isinstance(value_type, list):
-            value_data = deserialize_array(buffer, getter_key, value_type[0])
+            return self.compile_array(getter_key, value_type[0])
 
         # Structs
         elif isinstance(value_type, dict):
-            struct_buffer = getattr(buffer, getter_key)()
-            if struct_buffer == None:
-                continue
+            getter = getattr(self.table, getter_key)
+            decoder = SchemaDecoder.get(value_type, self.numpy_arrays)
+
+            def read_struct(buffer):
+                struct_buffer = getter(buffer)
+                if struct_buffer is None:
+                    return SKIP
 
-            value_data = deserialize_flatbuffer(struct_buffer, schema[key])
+                return decoder.decode(struct_buffer)
+
+            return read_struct, None
 
         # String-Enum
         elif issubclass(value_type, IntEnum):
-            enum_value = getattr(buffer, getter_key)()
-            if (enum_value == default_value): continue
-            value_data = value_type(enum_value).name
-        
-        if (clean and value_data is None):
-            continue
-        
-        if (default_value != value_data):
-            result[key] = value_data if value_data is not None else default_value
+            getter = getattr(self.table, getter_key)
+            names = {item.value: item.name for item in value_type}
 
-    return result
+            def read_enum(buffer):
+                enum_value = getter(buffer)
+                if (enum_value == default_value):
+                    return SKIP
+
+                name = names.get(enum_value)
+                return name if name is not None else value_type(enum_value).name
+
+            return read_enum, None
+
+        raise TypeError(f"Unsupported schema type: {value_type}")
+
+    def compile_array(self, getter_key: str, schema: any) -> tuple[Callable[[any], any], Callable[[any], any] | None]:
+        # List of numbers
+        if schema == int or schema == float:
+            getter = getattr(self.table, f"{getter_key}AsNumpy")
+
+            def read_numbers(buffer):
+                number_array = getter(buffer)
+                if isinstance(number_array, int) and number_array == 0:
+                    return None
+
+                return number_array
+
+            if (self.numpy_arrays):
+                return read_numbers, normalize_int_ndarray if schema == int else normalize_float_ndarray
+
+            return read_numbers, normalize_int_array if schema == int else normalize_float_array
+
+        # Structs | strings
+        length_getter = getattr(self.table, f"{getter_key}Length")
+        item_getter = getattr(self.table, getter_key)
 
+        if (schema == str):
+            def read_strings(buffer):
+                object_number = length_getter(buffer)
+                if (object_number == 0):
+                    return None
 
-def deserialize_glb_json(data: bytes, clean: bool = False) -> dict:
+                return [bytes(item_getter(buffer, i)).decode('utf8') for i in range(object_number)]
+
+            return read_strings, None
+
+        decoder = SchemaDecoder.get(schema, self.numpy_arrays)
+
+        def read_objects(buffer):
+            object_number = length_getter(buffer)
+            if (object_number == 0):
+                return None
+
+            decode = decoder.decode
+            return [decode(item_getter(buffer, i)) for i in range(object_number)]
+
+        return read_objects, None
+
+    def decode(self, buffer: any, keys: list[str] | None = None) -> OrderedDict:
+        """
+        Deserializes table to preprocessed dictionary.
+        Fields without value or with default value are skipped.
+
+        :param buffer: Flatbuffer table object
+        :param keys: Optional list of keys to decode only specific fields
+        """
+        result = OrderedDict()
+        fields = self.fields if keys is None else [self.fields[self.indices[key]] for key in keys]
+
+        for key, reader, normalizer, default_value in fields:
+            value_data = reader(buffer)
+            if (value_data is SKIP):
+                continue
+
+            if (default_value is None):
+                if (value_data is None):
+                    continue
+            elif (value_data == default_value):
+                continue
+            elif (value_data is None):
+                value_data = default_value
+
+            if (normalizer is not None):
+                value_data = normalizer(value_data)
+                if (value_data is None):
+                    continue
+
+            result[key] = value_data
+
+        return result
+
+
+def deserialize_flatbuffer(buffer: any, schema: dict, numpy_arrays: bool = False) -> dict:
+    return SchemaDecoder.get(schema, numpy_arrays).decode(buffer)
+
+
+class LazyDict(MutableMapping):
+    """
+    Dict-like proxy which loads values only on first access and memoizes them after.
+    Keys which loaders return None are treated as missing.
+    Use `to_dict` to get plain dictionary, e.g. for json serialization.
+    """
+
+    def __init__(self, loaders: dict[str, Callable[[], any]] | None = None):
+        self._loaders = dict(loaders or {})
+
+        # Ordered registry of all possible keys
+        self._keys: dict[str, None] = dict.fromkeys(self._loaders)
+        self._values = {}
+
+    def _load(self, key: str) -> any:
+        return self._loaders[key]()
+
+    def __getitem__(self, key: str) -> any:
+        if key in self._values:
+            return self._values[key]
+
+        if key not in self._keys:
+            raise KeyError(key)
+
+        value = self._load(key)
+        if value is None:
+            del self._keys[key]
+            raise KeyError(key)
+
+        self._values[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: any):
+        self._keys.setdefault(key)
+        self._values[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+
+        del self._keys[key]
+        del self._values[key]
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
+
+    def __iter__(self):
+        for key in list(self._keys.keys()):
+            if key in self:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        loaded = ", ".join(repr(key) for key in self._values.keys())
+        return f"{type(self).__name__}(loaded=[{loaded}])"
+
+    def to_dict(self) -> OrderedDict:
+        """Loads all values and returns them as plain dictionary, nested proxies are converted too"""
+        return materialize_data(self)
+
+
+def materialize_data(data: any) -> any:
+    """Recursively converts all `LazyDict` proxies in data to plain dictionaries"""
+    if isinstance(data, list):
+        return [materialize_data(value) for value in data]
+    elif isinstance(data, (dict, LazyDict)):
+        return OrderedDict((key, materialize_data(value)) for key, value in data.items())
+
+    return data
+
+
+class FlexBufferMap(LazyDict):
+    """
+    Lazy reader of FlexBuffer map. Only requested keys are decoded
+    """
+
+    def __init__(self, data: flexbuffers.Map):
+        super().__init__()
+        self._map = data
+        self._keys = dict.fromkeys(data.Keys.Value)
+
+    def _load(self, key: str) -> any:
+        return lazy_flexbuffer_value(self._map[key])
+
+
+def lazy_flexbuffer_value(ref: flexbuffers.Ref) -> any:
+    """Preprocessed value of FlexBuffer reference with maps wrapped into lazy readers"""
+    if ref.IsMap:
+        return FlexBufferMap(ref.AsMap)
+
+    if ref.IsVector:
+        values = [lazy_flexbuffer_value(item) for item in ref.AsVector]
+        return [value for value in values if value is not None]
+
+    return preprocess_data(ref.Value)
+
+
+class FlexBufferCache:
+    """
+    Content-addressed cache of decoded FlexBuffer payloads within a single file.
+    Byte-identical payloads are decoded only once and share the same value, so values must be treated as read-only.
+    In lazy mode maps are returned as `FlexBufferMap` readers
+    """
+
+    current: ContextVar["FlexBufferCache | None"] = ContextVar("flexbuffer_cache", default=None)
+
+    def __init__(self, lazy: bool = False):
+        self.lazy = lazy
+        self.values: dict[bytes, any] = {}
+
+    @contextmanager
+    def activate(self):
+        token = FlexBufferCache.current.set(self)
+        try:
+            yield self
+        finally:
+            FlexBufferCache.current.reset(token)
+
+    def load(self, data: bytes) -> any:
+        value = self.values.get(data, SKIP)
+        if value is SKIP:
+            value = self.decode(data)
+            self.values[data] = value
+
+        return value
+
+    def decode(self, data: bytes) -> any:
+        if not self.lazy:
+            return preprocess_data(deserialize_flexbuffer(data))
+
+        try:
+            return lazy_flexbuffer_value(flexbuffers.GetRoot(data))
+        except:
+            pass
+
+
+def deserialize_glb_root_lazy(flatbuffer: flat.Root, clean: bool = False, numpy_arrays: bool = False) -> LazyDict:
+    """
+    Lazy version of root deserialization. Every root section is deserialized only on first access
+    """
+
+    decoder = SchemaDecoder.get(gltf_schema, numpy_arrays)
+    cache = FlexBufferCache(lazy=True)
+
+    def section_loader(key: str) -> Callable[[], any]:
+        def load():
+            with cache.activate():
+                value = decoder.decode(flatbuffer, keys=[key]).get(key)
+
+            return clean_data(value) if clean else value
+
+        return load
+
+    def asset_loader() -> OrderedDict:
+        asset_info = section_loader("asset")()
+        if asset_info is None:
+            asset_info = OrderedDict(version="2.0")
+        asset_info["generator"] = "Supercell glTF Converter by DaniilSV"
+        return asset_info
+
+    loaders = {
+        key: section_loader(key) for key in gltf_schema.keys() if not key.startswith("_")
+    }
+    loaders["asset"] = asset_loader
+
+    return LazyDict(loaders)
+
+
+def deserialize_glb_json(data: bytes | memoryview, clean: bool = False, lazy: bool = False, numpy_arrays: bool = False) -> dict | LazyDict:
     """
     The function takes bytes of glTF FLA2 chunk data and returns a dictionary
     containing the deserialized JSON data.
 
-    :param data: A bytes that represents glTF FLA2 chunk data
+    :param data: A bytes that represents glTF FLA2 chunk data. Memoryview is read in place without copying
     :param clean: Returns cleaned data without empty arrays and default values
-    :type data: bytes
-    :return: JSON data in python dict that can be used for serialization to usual json or using in python
+    :param lazy: Returns dict-like proxy which deserializes root sections only on first access.
+    FlexBuffer maps (extensions and extras) are also read lazily key by key.
+    Data buffer must stay alive as long as proxy is used
+    :param numpy_arrays: Keeps numeric vectors (min/max, transforms, children, joints, etc.) as numpy arrays instead of lists
+    :type data: bytes | memoryview
+    :return: JSON data in python dict that can be used for serialization to usual json or using in python.
+    Decoded extensions and extras are shared between byte-identical payloads and must be treated as read-only
     """
-    flatbuffer = flat.Root.GetRootAs(bytearray(data))
+    flatbuffer = flat.Root.GetRootAs(data)
+    if (lazy):
+        return deserialize_glb_root_lazy(flatbuffer, clean, numpy_arrays)
+
+    # Data is already preprocessed during deserialization
+    with FlexBufferCache().activate():
+        output = deserialize_flatbuffer(flatbuffer, gltf_schema, numpy_arrays)
+
+    if (clean):
+        output = clean_data(output) or OrderedDict()
 
-    output = deserialize_flatbuffer(flatbuffer, gltf_schema, clean)
-    asset_info = output.get("asset", {"version": "2.0"})
+    asset_info = output.get("asset", OrderedDict(version="2.0"))
     asset_info["generator"] = "Supercell glTF Converter by DaniilSV"
     output["asset"] = asset_info
 
-    return preprocess_data(output, clean)
+    return output
 
 
 #! ---------------- Serializing ----------------
@@ -1,7 +1,8 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, FrozenSet, Callable
 from io_scene_gltf2.io.imp.gltf2_io_gltf import glTFImporter
-from .variables import ScShaderVariables, ShaderProperty
+from .variables import ScShaderVariables, ShaderProperty, ShaderTextureProperty
 from enum import IntEnum
+import hashlib
 
 class ScBlendMode(IntEnum):
     Opaque = 4
@@ -17,49 +18,73 @@ class ScShaderMaterial:
         # Index of blending mode
         self.blend_mode = ScBlendMode.Opaque
         
-        # Array of string which describes which shader features material should use
-        self._constants: List[str] = []
+        # Set of strings which describes which shader features material should use
+        self._constants: FrozenSet[str] = frozenset()
+        
+        # Constants in original order, duplicates included. Each distinct constant has its own bit in usage mask
+        self._constants_order: Tuple[str, ...] = ()
+        self._constants_bits: Dict[str, int] = {}
         
         # Settings variables for shader
         self._variables = ScShaderVariables()
+        self._variables_bits: Dict[str, int] = {}
         
         # Name of material shader
         self.shader_name = ""
 
-        self._used_variables = set()
-        self._used_constants = set()
+        # Usage bitmasks of variables and constants
+        self._used_variables = 0
+        self._used_constants = 0
         
     def has_constant(self, key: str) -> bool:
-        if (key in self._constants):
-            self._used_constants.add(key)
-            return True
+        bit = self._constants_bits.get(key)
+        if (bit is None):
+            return False
         
-        return False
+        self._used_constants |= bit
+        return True
     
     def get_property(self, key: str, desired_type = None) -> ShaderProperty | None:
-        if (key in self._variables.properties):
-            result = self._variables.properties[key]
-            if (desired_type is not None and not isinstance(result, desired_type)):
-                return None
-            
-            self._used_variables.add(key)
-            return result
+        result = self._variables.properties.get(key)
+        if (result is None):
+            return None
+        
+        if (desired_type is not None and not isinstance(result, desired_type)):
+            return None
         
-        return None
+        self._used_variables |= self._variables_bits[key]
+        return result
     
     @property
     def unused_constants(self) -> List[str]:
-        return [constant for constant in self._constants if constant not in self._used_constants]
+        return [constant for constant in self._constants_order if not self._used_constants & self._constants_bits[constant]]
     
     @property
     def unused_variables(self) -> List[Tuple[str, ShaderProperty]]:
-        return [(key, prop) for key, prop in self._variables.properties.items() if key not in self._used_variables]
+        return [(key, prop) for key, prop in self._variables.properties.items() if not self._used_variables & self._variables_bits[key]]
         
+    def content_hash(self, *extra: any, texture_resolver: Callable[[ShaderTextureProperty], str | None] | None = None) -> str:
+        """
+        Hash of everything that affects material look. Name is not included, so identical materials with different names have the same hash.
+        Texture paths are relative to imported file, with `texture_resolver` files they are resolved to are hashed too
+        """
+        variables = sorted(
+            (key, type(prop).__name__, repr(prop.value), repr(getattr(prop, "keywords", None)),
+             repr(texture_resolver(prop)) if texture_resolver is not None and isinstance(prop, ShaderTextureProperty) else None)
+            for key, prop in self._variables.properties.items()
+        )
+        content = (self.shader_name, int(self.blend_mode), sorted(self._constants), variables, extra)
+        
+        return hashlib.sha1(repr(content).encode("utf8")).hexdigest()
+    
     def from_dict(self, gltf: glTFImporter, data: Dict[str, any]):
         self.name = str(data.get("name", ""))
         self.blend_mode = ScBlendMode(int(data.get("blendMode", 4)))
-        self._constants = list(data.get("constants", []))
+        self._constants_order = tuple(data.get("constants", []))
+        self._constants = frozenset(self._constants_order)
+        self._constants_bits = {constant: 1 << i for i, constant in enumerate(dict.fromkeys(self._constants_order))}
         self.shader_name = str(data.get("shader", ""))
         
         self._variables.from_dict(gltf, data.get("variables", {}))
+        self._variables_bits = {key: 1 << i for i, key in enumerate(self._variables.properties)}
         
\ No newline at end of file
@@ -3,6 +3,8 @@ from io_scene_gltf2.io.imp.gltf2_io_gltf import glTFImporter
 from io_scene_gltf2.io.com.gltf2_io import Image
 
 class ShaderProperty:
+    __slots__ = ()
+    
     def __init__(self):
         pass
     
@@ -11,6 +13,8 @@ class ShaderProperty:
         return None
         
 class ShaderFloatProperty(ShaderProperty):
+    __slots__ = ("number",)
+    
     def __init__(self, value: float = 0.0):
         self.number = float(value)
         
@@ -19,6 +23,8 @@ class ShaderFloatProperty(ShaderProperty):
         return self.number
 
 class ShaderFloatVectorProperty(ShaderProperty):
+    __slots__ = ("vector",)
+    
     def __init__(self, vector: List[float] = []):
         self.vector = list(vector)
         
@@ -27,6 +33,8 @@ class ShaderFloatVectorProperty(ShaderProperty):
         return self.vector
         
 class ShaderTextureProperty(ShaderProperty):
+    __slots__ = ("texture_path", "keywords")
+    
     def __init__(self, path: str = ""):
         self.texture_path = path
         self.keywords: List[str] = []
@@ -41,6 +49,8 @@ class ShaderTextureProperty(ShaderProperty):
         return self.texture_path
             
 class ShaderBooleanProperty(ShaderProperty):
+    __slots__ = ("status",)
+    
     def __init__(self, value: bool = False):
         self.status = bool(value)
         
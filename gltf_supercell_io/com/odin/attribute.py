@@ -1,6 +1,64 @@
 from .constants import OdinAttributeFormat as Format
 import numpy as np
 
+
+def unpack_normalized_weights(values: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Unpacks column of 11/11/10 bit packed skin weights into (N, 4) float32 array.
+    The first weight is not stored and restored from the rest ones.
+
+    :param values: Array of packed uint32 values
+    :param out: Optional preallocated (N, 4) float32 buffer to write weights into
+    :return: Unpacked weights
+    """
+    values = np.asarray(values, dtype=np.uint32).reshape(-1)
+    if (out is None):
+        out = np.empty((len(values), 4), dtype=np.float32)
+
+    x = (values >> 21) * 0.0002442
+    y = ((values >> 10) & 0x7FF) * 0.0002442
+    z = (values & 0x3FF) * 0.0002442
+
+    out[:, 0] = ((1.0 - x) - y) - z
+    out[:, 1] = x
+    out[:, 2] = y
+    out[:, 3] = z
+
+    return out
+
+
+def storage_format(format: Format) -> tuple[any, int]:
+    """Numpy type and count of components as they are actually stored in buffer"""
+    match(format):
+        case Format.NormalizedWeightVector:
+            # All 4 weights are packed into single integer
+            return (np.uint32, 1)
+        case _:
+            return (Format.to_numpy_dtype(format), Format.to_element_count(format))
+
+
+def convert_stored_data(format: Format, data: np.ndarray, normalize: bool = False) -> np.ndarray:
+    """
+    Converts elements as they are stored in buffer into new contiguous (N, elements_count) array
+
+    :param format: Format of attribute
+    :param data: (N, storage count) array of stored elements, may be a strided view
+    :param normalize: Converts normalized formats to float32 in [0, 1] range
+    :return: Decoded elements
+    """
+    match(format):
+        case Format.NormalizedWeightVector:
+            return unpack_normalized_weights(data)
+        case _:
+            dtype = Format.to_numpy_dtype(format)
+            if (normalize and Format.is_normalized(format)):
+                array = data.astype(np.float32)
+                array /= np.iinfo(dtype).max
+                return array
+
+            return np.array(data, dtype=dtype)
+
+
 class OdinAttribute:
     def __init__(self, buffer: np.array, format: Format, offset: int, element_offset: int, stride: int) -> None:
         self.element_offset = element_offset
@@ -12,21 +70,70 @@ class OdinAttribute:
         self.elements_count = Format.to_element_count(self.format)
         self.data = buffer
         
+    @property
+    def storage(self) -> tuple[any, int]:
+        """Numpy type and count of components as they are actually stored in buffer"""
+        return storage_format(self.format)
+
+    def __len__(self) -> int:
+        """Count of elements that can be addressed in buffer"""
+        storage_dtype, storage_count = self.storage
+        element_size = np.dtype(storage_dtype).itemsize * storage_count
+        available = len(self.data) - self.offset - self.element_offset - element_size
+        if (available < 0):
+            return 0
+
+        if (self.stride == 0):
+            return 1
+
+        return (available // self.stride) + 1
+
+    def view(self, count: int) -> np.ndarray:
+        """Strided view over first `count` elements of interleaved vertex stream. Data is not copied"""
+        storage_dtype, storage_count = self.storage
+
+        return np.ndarray(
+            shape=(count, storage_count),
+            dtype=storage_dtype,
+            buffer=self.data,
+            offset=self.offset + self.element_offset,
+            strides=(self.stride, np.dtype(storage_dtype).itemsize)
+        )
+
+    def decode(self, indices: np.ndarray | None = None) -> np.ndarray:
+        """
+        Bulk version of `read`. Gathers all elements by given indices (or whole stream if there is no indices)
+        and returns them as (N, elements_count) array
+        """
+        if (indices is None):
+            count = len(self)
+        else:
+            count = int(indices.max()) + 1 if len(indices) else 0
+
+        stream = self.view(count)
+        data = stream if indices is None else stream[indices]
+
+        return convert_stored_data(self.format, data)
+
+    def materialize(self, count: int | None = None) -> np.ndarray:
+        """
+        Decodes first `count` elements of stream into contiguous array, just like glTF importer does for regular accessors.
+        Normalized formats are converted to float32 in [0, 1] range
+        """
+        if (count is None):
+            count = len(self)
+
+        stream = self.view(min(count, len(self)))
+
+        return convert_stored_data(self.format, stream, normalize=True)
+
     def read(self, offset: int) -> np.array:
         match(self.format):
             case Format.NormalizedWeightVector:
                 value = np.frombuffer(
                     self.data, dtype=np.uint32, offset=offset, count=1
-                )[0]
-                x = (value >> 21) * 0.0002442
-                y = ((value >> 10) & 0x7FF) * 0.0002442
-                z = (value & 0x3FF) * 0.0002442
-                array = np.array([
-                    ((1.0 - x) - y) - z,
-                    x,
-                    y,
-                    z
-                ], dtype=self.dtype)
+                )
+                array = unpack_normalized_weights(value)[0]
             case _:
                 array = np.frombuffer(
                     self.data, dtype=self.dtype, offset=offset, count=self.elements_count
@@ -40,8 +147,6 @@ class OdinAttribute:
             return self.read(offset)
         
         elif (isinstance(value, np.ndarray)):
-            return [
-                self.__getitem__(v) for v in value
-            ]
+            return self.decode(value)
             
         return None
\ No newline at end of file
@@ -31,11 +31,21 @@ class OdinAttributeType(IntEnum):
             OdinAttributeType.a_uv1: 'TEXCOORD_1',
             OdinAttributeType.a_color: 'COLOR_0',
             OdinAttributeType.a_color1: 'COLOR_1',
-            OdinAttributeType.a_tangent: "TANGENT"
+            OdinAttributeType.a_tangent: "TANGENT",
             # OdinAttributeType.a_colorAdd: 'COLOR_1',
             # OdinAttributeType.a_colorMul: 'COLOR_2',
+
+            # Rows of per instance transform matrix
+            OdinAttributeType.a_model: '_MODEL_0',
+            OdinAttributeType.a_model2: '_MODEL_1',
+            OdinAttributeType.a_model3: '_MODEL_2',
         }[component_type]
 
+    @classmethod
+    def is_instanced(cls, component_type) -> bool:
+        """Instanced attributes are stepped once per instance instead of once per vertex"""
+        return component_type in (OdinAttributeType.a_model, OdinAttributeType.a_model2, OdinAttributeType.a_model3)
+
 
 class OdinAttributeFormat(IntEnum):
     UByteVector4 = 3
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class NodeHierarchy:
+    """
+    Flat index of node hierarchy built from parent indices.
+    Nodes are additionally laid out in depth-first order, so every subtree is a continuous range of that order
+    and ancestry can be checked in constant time.
+    """
+
+    def __init__(self, parents: np.ndarray):
+        """
+        :param parents: Parent index of every node, negative or out of range values mark root nodes
+        """
+        count = len(parents)
+        parents = np.asarray(parents, dtype=np.int64).reshape(-1)
+        self.parents = np.where((parents >= 0) & (parents < count), parents, -1)
+
+        has_parent = self.parents >= 0
+        self.roots = np.flatnonzero(~has_parent)
+
+        # Children in CSR layout: children of node i are children_indices[children_offsets[i]:children_offsets[i + 1]]
+        childs = np.flatnonzero(has_parent)
+        childs = childs[np.argsort(self.parents[childs], kind='stable')]
+        self.children_indices = childs
+        self.children_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.parents[childs], minlength=count), out=self.children_offsets[1:])
+
+        # Depth of every node
+        self.depth = np.zeros(count, dtype=np.int64)
+        current = self.parents.copy()
+        mask = current >= 0
+        while mask.any():
+            self.depth[mask] += 1
+            current[mask] = self.parents[current[mask]]
+            mask = current >= 0
+            if (self.depth.max(initial=0) > count):
+                raise ValueError("Node hierarchy contains a cycle")
+
+        # Nodes grouped by depth levels, from roots to leaves
+        by_depth = np.argsort(self.depth, kind='stable')
+        bounds = np.cumsum(np.bincount(self.depth, minlength=1))
+        levels = np.split(by_depth, bounds[:-1])
+
+        # Subtree sizes, accumulated from leaves to roots
+        sizes = np.ones(count, dtype=np.int64)
+        for level in reversed(levels[1:]):
+            np.add.at(sizes, self.parents[level], sizes[level])
+
+        # Offset of every child inside parent subtree range
+        child_sizes = sizes[childs]
+        starts = np.cumsum(child_sizes) - child_sizes
+        sibling_offsets = np.zeros(count, dtype=np.int64)
+        sibling_offsets[childs] = starts - starts[self.children_offsets[self.parents[childs]]] if len(childs) else 0
+
+        # Depth-first positions and roots of every node, assigned from roots to leaves
+        self.positions = np.zeros(count, dtype=np.int64)
+        self.root_of = np.arange(count, dtype=np.int64)
+        root_sizes = sizes[self.roots]
+        self.positions[self.roots] = np.cumsum(root_sizes) - root_sizes
+        for level in levels[1:]:
+            level_parents = self.parents[level]
+            self.positions[level] = self.positions[level_parents] + 1 + sibling_offsets[level]
+            self.root_of[level] = self.root_of[level_parents]
+
+        self.subtree_ends = self.positions + sizes
+        self.order = np.empty(count, dtype=np.int64)
+        self.order[self.positions] = np.arange(count, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def children(self, idx: int) -> np.ndarray:
+        return self.children_indices[self.children_offsets[idx]:self.children_offsets[idx + 1]]
+
+    def subtree(self, idx: int) -> np.ndarray:
+        """Node with all its descendants in depth-first order"""
+        return self.order[self.positions[idx]:self.subtree_ends[idx]]
+
+    def is_ancestor(self, ancestor: int, idx: int) -> bool:
+        """Checks if node is ancestor of another node or node itself"""
+        return bool(self.positions[ancestor] <= self.positions[idx] < self.subtree_ends[ancestor])
@@ -0,0 +1,201 @@
+from .constants import OdinAttributeFormat, OdinAttributeType
+from .attribute import OdinAttribute, storage_format, convert_stored_data
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import numpy as np
+
+
+def decode_mesh_data_info(buffer: np.array, mesh_info: dict) -> dict[str, OdinAttribute]:
+    """
+    Creates attributes of single mesh data info by its vertex descriptors
+
+    :param buffer: Buffer with vertex data of all mesh data infos
+    :param mesh_info: Mesh data info from Supercell glTF extension
+    :return: Attributes by glTF attribute names
+    """
+    attributes = {}
+
+    vertex_descriptors = mesh_info.get("vertexDescriptors")
+    for descriptors in vertex_descriptors:
+        offset = descriptors.get("offset", 0)
+        stride = descriptors.get("stride", 0)
+
+        for attribute in descriptors.get("attributes", []):
+            attribute_type = OdinAttributeType(attribute.get("index"))
+            # Per instance transforms are not vertex data
+            if (OdinAttributeType.is_instanced(attribute_type)):
+                continue
+
+            attribute_format = OdinAttributeFormat(attribute.get("format"))
+            element_offset = attribute.get("offset", 0)
+
+            name = OdinAttributeType.to_attribute_name(attribute_type)
+            attributes[name] = OdinAttribute(
+                buffer, attribute_format, offset, element_offset, stride
+            )
+
+    return attributes
+
+
+def vertex_descriptor_dtype(descriptor: dict) -> tuple[np.dtype, dict[str, OdinAttributeFormat]] | None:
+    """
+    Builds structured type of single interleaved vertex, with one field per attribute
+
+    :param descriptor: Vertex descriptor from mesh data info
+    :return: Vertex type and formats of its fields by glTF attribute names, or None if vertex can't be described by structured type
+    """
+    stride = descriptor.get("stride", 0)
+
+    names, formats, offsets, attribute_formats = [], [], [], {}
+    itemsize = 0
+    for attribute in descriptor.get("attributes", []):
+        attribute_type = OdinAttributeType(attribute.get("index"))
+        if (OdinAttributeType.is_instanced(attribute_type)):
+            continue
+
+        attribute_format = OdinAttributeFormat(attribute.get("format"))
+        element_offset = attribute.get("offset", 0)
+        storage_dtype, storage_count = storage_format(attribute_format)
+
+        # Overlapping vertices can only be read by separate strided views
+        end = element_offset + np.dtype(storage_dtype).itemsize * storage_count
+        if (end > stride):
+            return None
+
+        itemsize = max(itemsize, end)
+
+        name = OdinAttributeType.to_attribute_name(attribute_type)
+        names.append(name)
+        formats.append((storage_dtype, (storage_count,)))
+        offsets.append(element_offset)
+        attribute_formats[name] = attribute_format
+
+    # Descriptor without attributes of requested kind has nothing to read
+    if (not names):
+        return None
+
+    # Padding after last attribute is not included, so last vertex of buffer is readable even without it
+    dtype = np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": itemsize})
+    return dtype, attribute_formats
+
+
+def materialize_mesh_data_info(buffer: np.array, mesh_info: dict, count: int | None = None, normalize: bool = True) -> dict[str, np.ndarray]:
+    """
+    Decodes all attributes of mesh data info into contiguous typed arrays.
+    Vertices of every descriptor are copied out of interleaved buffer once, then attributes are split from this compact copy
+
+    :param buffer: Buffer with vertex data of all mesh data infos
+    :param mesh_info: Mesh data info from Supercell glTF extension
+    :param count: Count of vertices to decode, by default all vertices that fit into buffer
+    :param normalize: Converts normalized formats to float32 in [0, 1] range
+    :return: Decoded arrays by glTF attribute names
+    """
+    arrays = {}
+
+    for descriptor in mesh_info.get("vertexDescriptors"):
+        offset = descriptor.get("offset", 0)
+        vertex = vertex_descriptor_dtype(descriptor)
+
+        if (vertex is None):
+            attributes = decode_mesh_data_info(buffer, {"vertexDescriptors": [descriptor]})
+            for name, attribute in attributes.items():
+                data = attribute.view(min(count, len(attribute)) if count is not None else len(attribute))
+                arrays[name] = convert_stored_data(attribute.format, data, normalize)
+            continue
+
+        dtype, formats = vertex
+        stride = descriptor.get("stride", 0)
+        available = max(0, (len(buffer) - offset - dtype.itemsize) // stride + 1)
+        records = np.ndarray(
+            shape=(available if count is None else min(count, available),),
+            dtype=dtype,
+            buffer=buffer,
+            offset=offset,
+            strides=(stride,)
+        )
+
+        # Single pass over buffer that drops padding between vertices, fields are read from cache friendly memory afterwards
+        records = np.ascontiguousarray(records)
+
+        for name, attribute_format in formats.items():
+            arrays[name] = convert_stored_data(attribute_format, records[name], normalize)
+
+    return arrays
+
+
+def weld_vertices(attributes: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds duplicated vertices by comparing packed bytes of all their attributes at once
+
+    :param attributes: Per vertex arrays of the same length
+    :return: Indices of vertices which are kept, in order of first occurrence, and new index of every vertex
+    """
+    arrays = list(attributes.values())
+    count = len(arrays[0]) if arrays else 0
+    if (count == 0):
+        return np.arange(count), np.arange(count)
+
+    rows = []
+    for array in arrays:
+        # Negative zero must be equal to positive one
+        if (np.issubdtype(array.dtype, np.floating)):
+            array = array + array.dtype.type(0)
+
+        rows.append(np.ascontiguousarray(array).view(np.uint8).reshape(count, -1))
+
+    rows = np.ascontiguousarray(np.concatenate(rows, axis=1))
+    keys = rows.view(np.dtype((np.void, rows.shape[1]))).reshape(-1)
+
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    # Unique keys are sorted by their bytes, first occurrence order is restored here
+    order = np.argsort(first, kind='stable')
+    remap = np.empty(len(order), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+
+    return first[order], remap[inverse.reshape(-1)]
+
+
+class MeshDataCache:
+    """
+    Decoded mesh data infos shared between all their consumers.
+    Consumers are counted in advance and data is released right after the last of them
+    """
+
+    def __init__(self, decoder: Callable[[int], dict]):
+        self.decoder = decoder
+        self.references: dict[int, int] = {}
+        self.data: dict[int, dict] = {}
+
+    def __contains__(self, idx: int) -> bool:
+        return idx in self.data
+
+    def add_reference(self, idx: int):
+        self.references[idx] = self.references.get(idx, 0) + 1
+
+    def acquire(self, idx: int) -> dict:
+        """Returns decoded mesh data info, decodes it on first request"""
+        if (idx not in self.data):
+            self.data[idx] = self.decoder(idx)
+
+        return self.data[idx]
+
+    def prefetch(self, indices: list[int], threads: int | None = None):
+        """Decodes given mesh data infos in advance on thread pool. Decoder must not depend on Blender data"""
+        indices = [idx for idx in indices if idx not in self.data]
+        if (not indices):
+            return
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for idx, data in zip(indices, executor.map(self.decoder, indices)):
+                self.data[idx] = data
+
+    def release(self, idx: int):
+        """Marks that one of consumers is done with mesh data info. Data is freed when there is no consumers left"""
+        references = self.references.get(idx, 0) - 1
+        if (references > 0):
+            self.references[idx] = references
+            return
+
+        self.references.pop(idx, None)
+        self.data.pop(idx, None)
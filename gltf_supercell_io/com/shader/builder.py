@@ -5,6 +5,7 @@ from typing import Tuple
 from enum import StrEnum
 from ..materials import ScShaderMaterial, ScBlendMode
 from ..materials.variables import ShaderFloatVectorProperty, ShaderFloatProperty, ShaderTextureProperty, ShaderBooleanProperty, ShaderProperty
+from .textures import TextureRegistry
 
 
 class ShaderPresetType(StrEnum):
@@ -12,15 +13,74 @@ class ShaderPresetType(StrEnum):
     BRAWL_STARS_LEGACY = "LegacyBrawlStars"
 
 
+class ShaderLibrary:
+    """Session-wide storage of shader node groups linked from add-on library"""
+    NodeGroups = ("ScUnlitShader", "ScLegacyBrawlStarsShader")
+
+    # Node groups by their ids. References become invalid when Blender loads another file
+    node_groups: dict[str, bpy.types.ShaderNodeTree] = {}
+    validated = False
+
+    @classmethod
+    def cached(cls, id: str) -> bpy.types.ShaderNodeTree | None:
+        asset = cls.node_groups.get(id)
+        if (asset is None):
+            return None
+
+        try:
+            # Accessing removed datablock raises an error
+            asset.name
+        except ReferenceError:
+            return None
+
+        return asset
+
+    @classmethod
+    def load(cls):
+        """Links all shader node groups in a single library load"""
+        with bpy.data.libraries.load(ShaderBuilder.LibraryPath, link=True, assets_only=True) as (data_from, data_to):
+            if (not cls.validated):
+                missing = [id for id in cls.NodeGroups if id not in data_from.node_groups]
+                if (missing):
+                    raise ImportError(f"Supercell IO shader library is missing node groups: {', '.join(missing)}")
+
+            data_to.node_groups = list(cls.NodeGroups)
+
+        for asset in data_to.node_groups:
+            if (asset is not None):
+                cls.node_groups[asset.name] = asset
+
+        cls.validated = True
+
+    @classmethod
+    def get(cls, id: str) -> bpy.types.ShaderNodeTree:
+        asset = cls.cached(id)
+        if (asset is not None):
+            return asset
+
+        # Node group may be already linked to current file
+        asset = bpy.data.node_groups.get(id)
+        if (asset is None):
+            cls.load()
+            asset = cls.cached(id)
+
+        if (asset is None):
+            raise ImportError("Failed to instantiate Supercell IO shader")
+
+        cls.node_groups[id] = asset
+        return asset
+
+
 class ShaderBuilder:
     LibraryName = "SupercellIO"
     BaseDirectory = os.path.dirname(os.path.abspath(__file__))
     LibraryPath = os.path.join(
         BaseDirectory, "library", "supercell_io_shaders.blend")
 
-    def __init__(self, sc_material: ScShaderMaterial, material: bpy.types.Material):
+    def __init__(self, sc_material: ScShaderMaterial, material: bpy.types.Material, textures: TextureRegistry | None = None):
         self.sc_material = sc_material
         self.material = material
+        self.textures = textures
         self.shader: ShaderNodeGroup = None
         self.node_counter = 0
         self.image_cache = {}
@@ -93,6 +153,9 @@ class ShaderBuilder:
 
             node.location = x, y
             node.extension = "REPEAT" if "repeat" in prop.keywords else "CLIP"
+            if (self.textures is not None):
+                node.image = self.textures.get(prop)
+
             self.node_counter += 1
             self.image_cache[prop.texture_path] = node
 
@@ -134,14 +197,7 @@ class ShaderBuilder:
         socket.default_value = prop.status
 
     def instantiate_shader(self, id: str, name: str) -> ShaderNodeGroup:
-        asset = bpy.data.node_groups.get(id)
-        if (asset is None):
-            with bpy.data.libraries.load(ShaderBuilder.LibraryPath, link=True, assets_only=True) as (data_from, data_to):
-                data_to.node_groups = [id]
-
-            asset = bpy.data.node_groups.get(id)
-            if asset is None:
-                raise ImportError("Failed to instantiate Supercell IO shader")
+        asset = ShaderLibrary.get(id)
 
         shader: ShaderNodeGroup = self.material.node_tree.nodes.new(
             "ShaderNodeGroup"
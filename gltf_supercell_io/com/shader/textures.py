@@ -0,0 +1,52 @@
+import bpy
+import os
+from ..materials.variables import ShaderTextureProperty
+
+
+class TextureRegistry:
+    """Resolves texture paths of Supercell materials to images shared between all materials of import"""
+
+    # Formats that Blender can't read are looked up with these extensions instead
+    FallbackExtensions = (".png", ".tga", ".jpg")
+
+    # Compressed GPU formats, decoded copies of them are preferred when they exist
+    UndecodableExtensions = (".ktx", ".sctx")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.images: dict[tuple[str, frozenset[str]], bpy.types.Image | None] = {}
+
+    def find_file(self, texture_path: str) -> str | None:
+        candidates = [texture_path] if os.path.isabs(texture_path) else [
+            os.path.join(self.directory, texture_path),
+            os.path.join(self.directory, os.path.basename(texture_path))
+        ]
+
+        for candidate in candidates:
+            stem, extension = os.path.splitext(candidate)
+            fallbacks = [stem + fallback for fallback in TextureRegistry.FallbackExtensions]
+            paths = [*fallbacks, candidate] if extension.lower() in TextureRegistry.UndecodableExtensions else [candidate, *fallbacks]
+            for path in paths:
+                if (os.path.isfile(path)):
+                    return path
+
+        return None
+
+    def load(self, prop: ShaderTextureProperty) -> bpy.types.Image | None:
+        path = self.find_file(prop.texture_path)
+        if (path is None):
+            return None
+
+        # Pixels are read by Blender only when image is actually used
+        try:
+            return bpy.data.images.load(path, check_existing=True)
+        except RuntimeError as error:
+            print(f"Failed to load texture {path}: {error}")
+            return None
+
+    def get(self, prop: ShaderTextureProperty) -> bpy.types.Image | None:
+        key = (prop.texture_path, frozenset(prop.keywords))
+        if (key not in self.images):
+            self.images[key] = self.load(prop)
+
+        return self.images[key]
@@ -0,0 +1,364 @@
+"""
+Standalone converter between Supercell FLA2 GLB files and standard JSON GLB files.
+Does not depend on Blender, only on flatbuffers and numpy.
+
+Usage:
+    python -m gltf_supercell_io.converter --output DIR [options] <files or directories>
+
+Direction of conversion is chosen by first chunk of each file: FLA2 files are converted to JSON and back.
+
+Options:
+    --output DIR      Directory for converted files, required. Source files are never overwritten
+    --jobs N          Count of processes used to convert files in parallel
+    --decode-odin     Decodes Odin vertex streams into standard glTF accessors when converting to JSON
+"""
+from .com import glTF_extension_name
+from .com.flatbuffer import deserialize_glb_json, serialize_glb_json
+from .com.odin.constants import OdinAttributeFormat
+from .com.odin.mesh import decode_mesh_data_info, materialize_mesh_data_info
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import pathlib
+import struct
+import sys
+import numpy as np
+
+GLB_MAGIC = b'glTF'
+GLB_VERSION = 2
+CHUNK_JSON = b'JSON'
+CHUNK_FLAT = b'FLA2'
+CHUNK_BIN = b'BIN\0'
+
+INDEX_COMPONENT_TYPES = {
+    5121: np.uint8,
+    5123: np.uint16,
+    5125: np.uint32,
+}
+
+
+#! ---------------- GLB ----------------
+
+
+def read_glb(content: bytes | memoryview) -> list[tuple[bytes, memoryview]]:
+    """Returns list of chunks (type, data) of GLB file"""
+    content = memoryview(content)
+    if content[:4] != GLB_MAGIC:
+        raise ValueError("This file is not a glTF/glb file")
+
+    version, file_size = struct.unpack_from('<II', content, 4)
+    if version != GLB_VERSION:
+        raise ValueError("GLB version must be 2; got %d" % version)
+    if file_size != len(content):
+        raise ValueError("Bad GLB: file size doesn't match")
+
+    chunks = []
+    offset = 12
+    while offset < file_size:
+        length, name = struct.unpack_from('<I4s', content, offset)
+        offset += 8
+        if offset + length > file_size:
+            raise ValueError("Bad GLB: chunk length exceeds file size")
+
+        chunks.append((name, content[offset:offset + length]))
+        offset += length
+
+    return chunks
+
+
+def pad_chunk(data: bytes, padding: bytes) -> bytes:
+    remainder = len(data) % 4
+    if remainder == 0:
+        return data
+
+    return data + padding * (4 - remainder)
+
+
+def write_glb(chunks: list[tuple[bytes, bytes]]) -> bytes:
+    body = bytearray()
+    for name, data in chunks:
+        body += struct.pack('<I4s', len(data), name)
+        body += data
+
+    return struct.pack('<4sII', GLB_MAGIC, GLB_VERSION, 12 + len(body)) + body
+
+
+#! ---------------- Odin ----------------
+
+
+class BinaryWriter:
+    """Appends new buffer views to existing binary chunk"""
+
+    def __init__(self, gltf: dict, data: bytes):
+        self.gltf = gltf
+        self.data = bytearray(data)
+
+    def add_buffer_view(self, data: bytes, stride: int | None = None) -> int:
+        self.data += b'\0' * (-len(self.data) % 4)
+
+        buffer_view = {
+            "buffer": 0,
+            "byteOffset": len(self.data),
+            "byteLength": len(data),
+            "target": 34962
+        }
+        if stride is not None:
+            buffer_view["byteStride"] = stride
+
+        self.data += data
+
+        buffer_views = self.gltf.setdefault("bufferViews", [])
+        buffer_views.append(buffer_view)
+        return len(buffer_views) - 1
+
+    def add_accessor(self, array: np.ndarray, format: OdinAttributeFormat) -> int:
+        count, components = array.shape
+        element_size = array.itemsize * components
+
+        # Vertex attributes must be aligned to 4 bytes
+        stride = None
+        if element_size % 4 != 0:
+            stride = element_size + (-element_size % 4)
+            rows = np.zeros((count, stride), dtype=np.uint8)
+            rows[:, :element_size] = array.view(np.uint8).reshape(count, element_size)
+            data = rows.tobytes()
+        else:
+            data = array.tobytes()
+
+        accessor = {
+            "bufferView": self.add_buffer_view(data, stride),
+            "componentType": OdinAttributeFormat.to_accessor_component(format),
+            "count": count,
+            "type": OdinAttributeFormat.to_accessor_type(format),
+        }
+        if OdinAttributeFormat.is_normalized(format):
+            accessor["normalized"] = True
+
+        accessors = self.gltf.setdefault("accessors", [])
+        accessors.append(accessor)
+        return len(accessors) - 1
+
+    def finish(self) -> bytes:
+        buffers = self.gltf.get("buffers") or [{}]
+        buffers[0] = dict(buffers[0], byteLength=len(self.data))
+        self.gltf["buffers"] = buffers
+
+        return bytes(self.data)
+
+
+def get_buffer_view(gltf: dict, binary: memoryview, idx: int) -> memoryview:
+    buffer_view = gltf["bufferViews"][idx]
+    offset = buffer_view.get("byteOffset", 0)
+    return binary[offset:offset + buffer_view["byteLength"]]
+
+
+def read_indices(gltf: dict, binary: memoryview, idx: int) -> np.ndarray:
+    accessor = gltf["accessors"][idx]
+    dtype = INDEX_COMPONENT_TYPES[accessor["componentType"] & 0x0000FFFF]
+    data = get_buffer_view(gltf, binary, accessor["bufferView"])
+
+    return np.frombuffer(data, dtype=dtype, count=accessor["count"], offset=accessor.get("byteOffset", 0))
+
+
+def get_odin_descriptor(data: dict) -> dict | None:
+    extensions = data.get("extensions") or {}
+    return extensions.get(glTF_extension_name)
+
+
+def decode_odin_meshes(gltf: dict, binary: memoryview) -> bytes:
+    """
+    Decodes Odin vertex streams of all primitives into standard accessors.
+    Returns new binary chunk with appended accessors data
+    """
+    descriptor = get_odin_descriptor(gltf) or {}
+    mesh_infos = descriptor.get("meshDataInfos")
+    buffer_idx = descriptor.get("bufferView")
+    if mesh_infos is None or buffer_idx is None:
+        return bytes(binary)
+
+    vertex_buffer = get_buffer_view(gltf, binary, buffer_idx)
+
+    # Primitives of every mesh data info and count of vertices which they use
+    primitives: dict[int, list[dict]] = {}
+    vertex_counts: dict[int, int] = {}
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh.get("primitives", []):
+            mesh_info_idx = (get_odin_descriptor(primitive) or {}).get("meshDataInfoIndex")
+            if mesh_info_idx is None:
+                continue
+
+            primitives.setdefault(mesh_info_idx, []).append(primitive)
+            if primitive.get("indices") is not None:
+                indices = read_indices(gltf, binary, primitive["indices"])
+                count = int(indices.max()) + 1 if len(indices) else 0
+                vertex_counts[mesh_info_idx] = max(vertex_counts.get(mesh_info_idx, 0), count)
+
+    writer = BinaryWriter(gltf, binary)
+    for mesh_info_idx, users in primitives.items():
+        # Normalized data is kept as is, accessors are marked as normalized instead
+        arrays = materialize_mesh_data_info(
+            vertex_buffer, mesh_infos[mesh_info_idx], vertex_counts.get(mesh_info_idx), normalize=False
+        )
+        formats = {name: attribute.format for name, attribute in decode_mesh_data_info(vertex_buffer, mesh_infos[mesh_info_idx]).items()}
+
+        attributes = {}
+        for name, array in arrays.items():
+            accessor_idx = writer.add_accessor(array, formats[name])
+            if name == "POSITION":
+                accessor = gltf["accessors"][accessor_idx]
+                accessor["min"] = array.min(axis=0).tolist()
+                accessor["max"] = array.max(axis=0).tolist()
+
+            attributes[name] = accessor_idx
+
+        for primitive in users:
+            primitive["attributes"] = dict(attributes)
+
+    return writer.finish()
+
+
+def repair_gltf(gltf: dict):
+    """Repairs parts of Supercell glTF which are not readable without Odin extension"""
+    # Supercell specific component types
+    for accessor in gltf.get("accessors", []):
+        accessor["componentType"] = accessor["componentType"] & 0x0000FFFF
+
+    # Children relation from parent indices
+    nodes = gltf.get("nodes", [])
+    childrens: dict[int, list[int]] = {}
+    for i, node in enumerate(nodes):
+        parent = (get_odin_descriptor(node) or {}).get("parent")
+        if parent is not None:
+            childrens.setdefault(parent, []).append(i)
+
+    for idx, children in childrens.items():
+        nodes[idx]["children"] = children
+
+    # Meshes can be read without extension now
+    required = [name for name in gltf.get("extensionsRequired", []) if name != glTF_extension_name]
+    if required:
+        gltf["extensionsRequired"] = required
+    else:
+        gltf.pop("extensionsRequired", None)
+
+
+#! ---------------- Conversion ----------------
+
+
+def json_default(value: any) -> any:
+    """Numeric vectors are kept as numpy arrays while converting, they are turned into lists only when written"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def convert_to_json(chunk: memoryview, binary: memoryview | None, decode_odin: bool = False) -> list[tuple[bytes, bytes]]:
+    gltf = deserialize_glb_json(chunk, numpy_arrays=True)
+
+    binary_data = bytes(binary) if binary is not None else None
+    if decode_odin and binary is not None:
+        binary_data = decode_odin_meshes(gltf, binary)
+        repair_gltf(gltf)
+
+    json_data = json.dumps(gltf, separators=(',', ':'), default=json_default).encode('utf8')
+
+    chunks = [(CHUNK_JSON, pad_chunk(json_data, b' '))]
+    if binary_data is not None:
+        chunks.append((CHUNK_BIN, pad_chunk(binary_data, b'\0')))
+
+    return chunks
+
+
+def convert_to_flat(chunk: memoryview, binary: memoryview | None) -> list[tuple[bytes, bytes]]:
+    gltf = json.loads(str(chunk, encoding='utf8'))
+
+    chunks = [(CHUNK_FLAT, pad_chunk(serialize_glb_json(gltf), b'\0'))]
+    if binary is not None:
+        chunks.append((CHUNK_BIN, pad_chunk(bytes(binary), b'\0')))
+
+    return chunks
+
+
+def convert_file(source: str, target: str, decode_odin: bool = False) -> str:
+    """Converts single GLB file from FLA2 to JSON or back, returns type of written chunk"""
+    with open(source, 'rb') as file:
+        content = file.read()
+
+    chunks = read_glb(content)
+    name, chunk = chunks[0]
+    binary = next((data for chunk_name, data in chunks[1:] if chunk_name == CHUNK_BIN), None)
+
+    if name == CHUNK_FLAT:
+        result = convert_to_json(chunk, binary, decode_odin)
+    elif name == CHUNK_JSON:
+        result = convert_to_flat(chunk, binary)
+    else:
+        raise ValueError("Bad GLB: first chunk not JSON")
+
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    with open(target, 'wb') as file:
+        file.write(write_glb(result))
+
+    return result[0][0].decode('ascii')
+
+
+def collect_tasks(inputs: list[str], output: str) -> list[tuple[str, str]]:
+    tasks = []
+    for path in inputs:
+        path = pathlib.Path(path)
+        if path.is_dir():
+            sources = [(source, path) for source in sorted(path.rglob("*.glb"))]
+        else:
+            sources = [(path, path.parent)]
+
+        for source, base in sources:
+            target = pathlib.Path(output, source.relative_to(base))
+            tasks.append((str(source), str(target)))
+
+    return tasks
+
+
+def run_task(task: tuple[str, str, bool]) -> tuple[str, str | None]:
+    source, target, decode_odin = task
+    if os.path.abspath(source) == os.path.abspath(target):
+        return source, "Output file is the same as source file"
+
+    try:
+        convert_file(source, target, decode_odin)
+    except Exception as exception:
+        return source, f"{type(exception).__name__}: {exception}"
+
+    return source, None
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="gltf_supercell_io.converter", description="Supercell FLA2 <-> JSON glTF converter")
+    parser.add_argument("inputs", nargs="+", help="GLB files or directories")
+    parser.add_argument("--output", required=True, help="Output directory")
+    parser.add_argument("--jobs", type=int, default=1, help="Count of processes to convert files in parallel")
+    parser.add_argument("--decode-odin", action="store_true", help="Decode Odin vertex streams into standard accessors")
+    args = parser.parse_args(argv)
+
+    tasks = [(source, target, args.decode_odin) for source, target in collect_tasks(args.inputs, args.output)]
+
+    if args.jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            results = list(executor.map(run_task, tasks, chunksize=max(1, len(tasks) // (args.jobs * 4))))
+    else:
+        results = [run_task(task) for task in tasks]
+
+    failed = 0
+    for source, error in results:
+        if error is not None:
+            print(f"Failed to convert {source}: {error}")
+            failed += 1
+
+    print(f"Converted {len(results) - failed} of {len(results)} files")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,11 +1,13 @@
 import bpy
 
 from ..com import glTF_extension_name, glTF_material_extension_name
-from ..com.odin.constants import OdinAttributeFormat, OdinAttributeType
-from ..com.odin.attribute import OdinAttribute
+from ..com.odin.hierarchy import NodeHierarchy
+from ..com.odin.mesh import decode_mesh_data_info, materialize_mesh_data_info, MeshDataCache
 from ..com.materials import ScShaderMaterial
+from .mesh import SupercellMeshOptions, can_build_mesh, build_mesh
 
 from ..com.shader.builder import ShaderPresetType
+from ..com.shader.textures import TextureRegistry
 from ..com.shader.unlit import UnlitPreset
 from ..com.shader.brawlStarsLegacy import BrawlStarsLegacy
 
@@ -17,6 +19,10 @@ from io_scene_gltf2.io.imp.gltf2_io_binary import BinaryData
 
 from typing import List
 import numpy as np
+import os
+
+# Custom property with content hash of material built by add-on
+MATERIAL_HASH_PROPERTY = "$SupercellIOHash"
 
 
 class glTF2ImportUserExtension:
@@ -74,12 +80,12 @@ class glTF2ImportUserExtension:
         """Repairs gltf children relation indexing based on classic parent indexing stored in node extensions"""
         nodes: List[Node] = gltf.data.nodes or []
 
-        childrens: dict[int, list[int]] = {}
-
-        def add_child(idx: int, parent_idx: int):
-            if (parent_idx not in childrens):
-                childrens[parent_idx] = []
-            childrens[parent_idx].append(idx)
+        # Regular children relation is kept for nodes without Supercell parent
+        parents = np.full(len(nodes), -1, dtype=np.int64)
+        for i, node in enumerate(nodes):
+            for child in node.children or []:
+                if (0 <= child < len(nodes)):
+                    parents[child] = i
 
         for i, node in enumerate(nodes):
             extensions = node.extensions
@@ -91,10 +97,20 @@ class glTF2ImportUserExtension:
                 continue
 
             parent = descriptor.get("parent")
-            add_child(i, parent)
+            if (parent is not None):
+                parents[i] = parent
+
+        try:
+            hierarchy = NodeHierarchy(parents)
+        except ValueError as exception:
+            raise ImportError(str(exception))
+
+        for i, node in enumerate(nodes):
+            children = hierarchy.children(i)
+            node.children = children.tolist() if len(children) else None
 
-        for idx, children in childrens.items():
-            nodes[idx].children = children
+        # Shared by all fixups and later hooks
+        gltf.supercell_node_hierarchy = hierarchy
 
     def do_final_fixups(self, gltf: glTFImporter):
         """Very often Supercell glTF files have missing fields that are required by the importer, this function adds them back"""
@@ -103,16 +119,11 @@ class glTF2ImportUserExtension:
         nodes: List[Node] = gltf.data.nodes or []
         skins: List[Skin] = gltf.data.skins or []
 
+        hierarchy: NodeHierarchy = gltf.supercell_node_hierarchy
+
         # Fix for scene nodes
         if (gltf.data.scenes is None):
-            childrens = set()
-            for node in nodes:
-                if node.children is None:
-                    continue
-
-                childrens.update(node.children)
-
-            root_nodes = [i for i in range(len(nodes)) if i not in childrens]
+            root_nodes = hierarchy.roots.tolist()
             gltf.data.scenes = [Scene(None, None, None, root_nodes)]
         else:
             for scene in gltf.data.scenes:
@@ -125,25 +136,169 @@ class glTF2ImportUserExtension:
                 for skin in skins:
                     skin.skeleton = root_nodes[0]
             else:
-                children_mapping = {key: [] for key in root_nodes}
-                def visit(key: int, node_index: int):
-                    childrens = gltf.data.nodes[node_index].children or []
-                    
-                    for idx in childrens:
-                        children_mapping[key].append(idx)
-                        visit(key, idx)
-                
-                for key in root_nodes:
-                    visit(key, key)
-                
+                root_positions = {key: position for position, key in enumerate(root_nodes)}
                 for skin in skins:
-                    for key, childrens in children_mapping.items():
-                        if (any(i in childrens for i in skin.joints or [])):
-                            skin.skeleton = key
-                            break
+                    joints = np.asarray(skin.joints if skin.joints is not None else [], dtype=np.int64)
+                    joints = joints[(joints >= 0) & (joints < len(nodes))]
+
+                    # Roots themselves are not part of their skeletons
+                    joints = joints[hierarchy.parents[joints] >= 0]
+                    positions = [root_positions[key] for key in np.unique(hierarchy.root_of[joints]).tolist() if key in root_positions]
+                    if (positions):
+                        skin.skeleton = root_nodes[min(positions)]
 
         gltf.data.meshes = gltf.data.meshes or []
 
+    def prune_unused_data(self, gltf: glTFImporter):
+        """Removes meshes, mesh data infos, materials, skins and images which can't be reached from scene roots"""
+        hierarchy: NodeHierarchy = gltf.supercell_node_hierarchy
+        nodes: List[Node] = gltf.data.nodes or []
+        meshes: List[Mesh] = gltf.data.meshes or []
+        skins: List[Skin] = gltf.data.skins or []
+        materials: List[Material] = gltf.data.materials or []
+
+        def remap(used: set[int]) -> dict[int, int]:
+            return {old: new for new, old in enumerate(sorted(used))}
+
+        # Nodes
+        reachable = np.zeros(len(nodes), dtype=bool)
+        for scene in gltf.data.scenes or []:
+            for root in scene.nodes or []:
+                if (0 <= root < len(nodes)):
+                    reachable[hierarchy.subtree(root)] = True
+
+        used_meshes = set()
+        used_skins = set()
+        for i, node in enumerate(nodes):
+            if (not reachable[i]):
+                node.mesh = None
+                node.skin = None
+                continue
+
+            # Animation files have nodes with skin but without valid mesh, skin is still needed for armature
+            if (node.mesh is not None and node.mesh < len(meshes)):
+                used_meshes.add(node.mesh)
+            else:
+                node.mesh = None
+
+            if (node.skin is not None and node.skin < len(skins)):
+                used_skins.add(node.skin)
+            else:
+                node.skin = None
+
+        # Skin builds armature of its joints even if no mesh is bound to it
+        for i, skin in enumerate(skins):
+            if (any(0 <= joint < len(nodes) and reachable[joint] for joint in skin.joints or [])):
+                used_skins.add(i)
+
+        # Meshes data
+        used_materials = set()
+        used_mesh_infos = set()
+        for idx in used_meshes:
+            for primitive in meshes[idx].primitives or []:
+                if (primitive.material is not None and primitive.material < len(materials)):
+                    used_materials.add(primitive.material)
+
+                mesh_info_idx = self.get_mesh_info_index(primitive)
+                if (mesh_info_idx is not None):
+                    used_mesh_infos.add(mesh_info_idx)
+
+        mesh_mapping = remap(used_meshes)
+        skin_mapping = remap(used_skins)
+        material_mapping = remap(used_materials)
+        mesh_info_mapping = remap(used_mesh_infos)
+
+        for node in nodes:
+            if (node.mesh is not None):
+                node.mesh = mesh_mapping[node.mesh]
+            if (node.skin is not None):
+                node.skin = skin_mapping[node.skin]
+
+        gltf.data.meshes = [meshes[idx] for idx in mesh_mapping]
+        gltf.data.skins = [skins[idx] for idx in skin_mapping] or None
+        gltf.data.materials = [materials[idx] for idx in material_mapping] or None
+
+        for mesh in gltf.data.meshes:
+            for primitive in mesh.primitives or []:
+                primitive.material = material_mapping.get(primitive.material)
+
+                # Extension data may be shared between primitives, so it is replaced instead of being modified
+                mesh_info_idx = self.get_mesh_info_index(primitive)
+                if (mesh_info_idx is not None):
+                    descriptor = primitive.extensions[glTF_extension_name]
+                    primitive.extensions = {
+                        **primitive.extensions,
+                        glTF_extension_name: {**descriptor, "meshDataInfoIndex": mesh_info_mapping[mesh_info_idx]}
+                    }
+
+        descriptor = self.get_extension_descriptor(gltf)
+        if (descriptor is not None and descriptor.get("meshDataInfos") is not None):
+            mesh_infos = descriptor["meshDataInfos"]
+            gltf.data.extensions = {
+                **gltf.data.extensions,
+                glTF_extension_name: {**descriptor, "meshDataInfos": [mesh_infos[idx] for idx in mesh_info_mapping]}
+            }
+
+        # Images
+        images = gltf.data.images or []
+        textures = gltf.data.textures or []
+
+        # Image sources can also be stored in texture extensions
+        def has_source(extension) -> bool:
+            return isinstance(extension, dict) and extension.get("source") is not None
+
+        # Supercell materials reference images directly by index in their variables
+        def image_variables(material: Material) -> dict[str, int]:
+            descriptor = (material.extensions or {}).get(glTF_material_extension_name)
+            variables = descriptor.get("variables") if isinstance(descriptor, dict) else None
+            if (not isinstance(variables, dict)):
+                return {}
+
+            return {
+                key: value["index"] for key, value in variables.items()
+                if isinstance(value, dict) and value.get("index") is not None
+            }
+
+        used_images = set()
+        for texture in textures:
+            sources = [texture.source] + [extension["source"] for extension in (texture.extensions or {}).values() if has_source(extension)]
+            used_images.update(idx for idx in sources if idx is not None and idx < len(images))
+
+        for material in gltf.data.materials or []:
+            used_images.update(idx for idx in image_variables(material).values() if idx < len(images))
+
+        image_mapping = remap(used_images)
+        for texture in textures:
+            if (texture.source is not None):
+                texture.source = image_mapping.get(texture.source)
+
+            if (texture.extensions is not None):
+                texture.extensions = {
+                    name: {**extension, "source": image_mapping.get(extension["source"])}
+                    if has_source(extension) else extension
+                    for name, extension in texture.extensions.items()
+                }
+
+        # Material extension data may be shared too, so it is replaced as well
+        for material in gltf.data.materials or []:
+            variables = image_variables(material)
+            if (not variables):
+                continue
+
+            descriptor = material.extensions[glTF_material_extension_name]
+            material.extensions = {
+                **material.extensions,
+                glTF_material_extension_name: {
+                    **descriptor,
+                    "variables": {
+                        **descriptor["variables"],
+                        **{key: {**descriptor["variables"][key], "index": image_mapping.get(idx)} for key, idx in variables.items()}
+                    }
+                }
+            }
+
+        gltf.data.images = [images[idx] for idx in image_mapping] or None
+
     def setup_settings(self, gltf: glTFImporter):
         # Why tf this exists at all
         gltf.import_settings['disable_bone_shape'] = True
@@ -164,12 +319,65 @@ class glTF2ImportUserExtension:
         self.process_nodes_extension(gltf)
         self.do_final_fixups(gltf)
 
+        if (self.properties.prune_unused):
+            self.prune_unused_data(gltf)
+
         if (self.properties.better_settings):
             self.setup_settings(gltf)
 
+        # Built materials by their content hash, filled on first lookup
+        gltf.supercell_materials = None
+
+        # Images shared by all materials
+        gltf.supercell_textures = TextureRegistry(os.path.dirname(os.path.abspath(gltf.filename)))
+
         # Shared cache for all meshes import operations
-        gltf.supercell_vertex_cache = {}
+        # Meshes built by add-on itself need decoded arrays and keep colors compact
+        native_meshes = self.properties.native_meshes
+        decode_streams = self.properties.decode_streams or native_meshes
+        gltf.supercell_vertex_cache = MeshDataCache(lambda idx: self.decode_mesh_info(gltf, idx, decode_streams, not native_meshes))
+        gltf.supercell_normalized_streams = not native_meshes
+        gltf.supercell_native_mesh = None
+        gltf.supercell_vertex_counts = None
         gltf.supercell_vertex_accessor_offset = 0
+        gltf.supercell_mesh_accessors = {}
+        self.count_mesh_info_references(gltf)
+
+        # Streaming attributes are decoded lazily anyway, so there is nothing to do in advance
+        # Prefetch is opt-in since it holds decoded data of every mesh until its consumers are imported
+        if (decode_streams and self.properties.decode_threads != 1):
+            self.prefetch_mesh_infos(gltf)
+
+    def count_mesh_info_references(self, gltf: glTFImporter):
+        """Every pair of mesh and skin is imported as separate Blender mesh, each of them is a consumer of its mesh data infos"""
+        meshes: List[Mesh] = gltf.data.meshes or []
+        pairs = {
+            (node.mesh, node.skin) for node in gltf.data.nodes or []
+            if node.mesh is not None and node.mesh < len(meshes)
+        }
+
+        for mesh_idx, _ in pairs:
+            mesh_infos = {self.get_mesh_info_index(primitive) for primitive in meshes[mesh_idx].primitives or []}
+            for mesh_info_idx in mesh_infos - {None}:
+                gltf.supercell_vertex_cache.add_reference(mesh_info_idx)
+
+    def prefetch_mesh_infos(self, gltf: glTFImporter):
+        """Decodes all used mesh data infos at once on thread pool, mesh hooks will only pick up ready arrays"""
+        cache: MeshDataCache = gltf.supercell_vertex_cache
+        indices = sorted(cache.references.keys())
+        if (len(indices) < 2):
+            return
+
+        # Everything that touches importer state is prepared on main thread, workers only run numpy code
+        descriptor = self.get_extension_descriptor(gltf) or {}
+        buffer_idx = descriptor.get("bufferView")
+        if (buffer_idx is None):
+            return
+
+        BinaryData.get_buffer_view(gltf, buffer_idx)
+        self.get_vertex_count(gltf, indices[0])
+
+        cache.prefetch(indices, self.properties.decode_threads or None)
 
     def gather_import_node_before_hook(self, vnode: VNode, node: Node | None, gltf: glTFImporter):
         """Some nodes (especially in animation files) may have invalid indices, we need to clean them up to avoid errors"""
@@ -186,57 +394,60 @@ class glTF2ImportUserExtension:
                 vnode.type = VNode.DummyRoot
                 vnode.mesh_node_idx = None
 
-    def decode_mesh_attribute(self, gltf: glTFImporter, buffer_idx: int, attribute: dict, offset: int, stride: int) -> tuple[str, np.array]:
-        attribute_type = OdinAttributeType(attribute.get("index"))
-        attribute_format = OdinAttributeFormat(attribute.get("format"))
-        element_offset = attribute.get("offset", 0)
-        buffer_data = BinaryData.get_buffer_view(gltf, buffer_idx)
-
-        name = OdinAttributeType.to_attribute_name(attribute_type)
-        data = OdinAttribute(
-            buffer_data, attribute_format, offset, element_offset, stride
-        )
-
-        return (name, data)
-
-    def decode_mesh_info(self, gltf: glTFImporter, idx: int):
+    def decode_mesh_info(self, gltf: glTFImporter, idx: int, materialize: bool, normalize: bool = True) -> dict:
         descriptor = self.get_extension_descriptor(gltf) or {}
         mesh_infos: list[dict] = descriptor.get("meshDataInfos")
         buffer_idx = descriptor.get("bufferView")
         if (mesh_infos is None or buffer_idx is None):
             raise ImportError("Missing Supercell glTF mesh data")
 
-        # Prepare cache
-        attributes = {}
-
-        mesh_info = mesh_infos[idx]
-        vertex_descriptors = mesh_info.get("vertexDescriptors")
-        for descriptors in vertex_descriptors:
-            offset = descriptors.get("offset", 0)
-            stride = descriptors.get("stride", 0)
+        buffer_data = BinaryData.get_buffer_view(gltf, buffer_idx)
 
-            for attribute in descriptors.get("attributes", []):
-                name, data = self.decode_mesh_attribute(
-                    gltf, buffer_idx, attribute, offset, stride)
-                attributes[name] = data
+        # Whole vertex stream is decoded once into regular arrays, so importer can work with them as with any other accessor
+        if (materialize):
+            return materialize_mesh_data_info(buffer_data, mesh_infos[idx], self.get_vertex_count(gltf, idx), normalize)
 
-        gltf.supercell_vertex_cache[idx] = attributes
+        return decode_mesh_data_info(buffer_data, mesh_infos[idx])
 
-    def decode_primitive(self, gltf: glTFImporter, primitive: MeshPrimitive):
+    def get_mesh_info_index(self, primitive: MeshPrimitive) -> int | None:
         extensions = primitive.extensions
         if (extensions is None):
-            return
+            return None
 
         descriptor = extensions.get(glTF_extension_name)
         if (descriptor is None):
-            return
+            return None
 
-        mesh_info_idx = descriptor.get("meshDataInfoIndex")
+        return descriptor.get("meshDataInfoIndex")
+
+    def get_vertex_count(self, gltf: glTFImporter, mesh_info_idx: int) -> int | None:
+        """Mesh data infos do not store count of vertices, so it is taken from indices of all primitives that use mesh data info"""
+        if (gltf.supercell_vertex_counts is None):
+            counts: dict[int, int] = {}
+            for mesh in gltf.data.meshes or []:
+                for primitive in mesh.primitives or []:
+                    idx = self.get_mesh_info_index(primitive)
+                    if (idx is None or primitive.indices is None):
+                        continue
+
+                    indices = BinaryData.decode_accessor(gltf, primitive.indices)
+                    count = int(indices.max()) + 1 if len(indices) else 0
+                    counts[idx] = max(counts.get(idx, 0), count)
+
+            gltf.supercell_vertex_counts = counts
+
+        return gltf.supercell_vertex_counts.get(mesh_info_idx)
+
+    def decode_primitive(self, gltf: glTFImporter, primitive: MeshPrimitive):
+        mesh_info_idx = self.get_mesh_info_index(primitive)
         if (mesh_info_idx is None):
             return
 
-        if (mesh_info_idx not in gltf.supercell_vertex_cache):
-            self.decode_mesh_info(gltf, mesh_info_idx)
+        # Primitives of one mesh with the same mesh data info share the same accessors
+        accessors: dict[int, dict[str, int]] = gltf.supercell_mesh_accessors
+        if (mesh_info_idx in accessors):
+            primitive.attributes = dict(accessors[mesh_info_idx])
+            return
 
         # MEGA HACK: instead of writing writing back to buffer and then to accessors and blah blah blah...
         # We do next magic:
@@ -247,16 +458,35 @@ class glTF2ImportUserExtension:
         # We can just create our own accessor indices to which importer will ask data from,
         # so we can set it in advance in caching pool it will return our custom streaming attribute
         # Profit 500%
+        # With `decode_streams` option cache contains already decoded arrays instead of streaming attributes
+
+        attributes = {}
+        for name, data in gltf.supercell_vertex_cache.acquire(mesh_info_idx).items():
+            # Compact colors are kept for meshes built by add-on, importer expects them normalized
+            if (not gltf.supercell_normalized_streams and np.issubdtype(data.dtype, np.integer) and name.startswith("COLOR_")):
+                data = data.astype(np.float32) / np.iinfo(data.dtype).max
 
-        primitive.attributes = {}
-        for name, data in gltf.supercell_vertex_cache[mesh_info_idx].items():
             fake_accessor_idx = gltf.supercell_vertex_accessor_offset
-            primitive.attributes[name] = fake_accessor_idx
+            attributes[name] = fake_accessor_idx
             gltf.decode_accessor_cache[fake_accessor_idx] = data
             gltf.accessor_cache[fake_accessor_idx] = data
 
             gltf.supercell_vertex_accessor_offset += 1
 
+        accessors[mesh_info_idx] = attributes
+        primitive.attributes = dict(attributes)
+
+    def release_mesh_infos(self, gltf: glTFImporter):
+        """Removes fake accessors of imported mesh and frees mesh data infos which are not needed anymore"""
+        for mesh_info_idx, attributes in gltf.supercell_mesh_accessors.items():
+            for fake_accessor_idx in attributes.values():
+                gltf.decode_accessor_cache.pop(fake_accessor_idx, None)
+                gltf.accessor_cache.pop(fake_accessor_idx, None)
+
+            gltf.supercell_vertex_cache.release(mesh_info_idx)
+
+        gltf.supercell_mesh_accessors = {}
+
     def gather_import_mesh_options(self, mesh_options, pymesh: Mesh, skin_idx, gltf: glTFImporter):
         """Please khronos i need this. My glTF importer is kinda homeless"""
         if (not self.valid_gltf(gltf)):
@@ -267,10 +497,47 @@ class glTF2ImportUserExtension:
         # not a good place but... there will be no peaceful solution
 
         gltf.supercell_vertex_accessor_offset = len(gltf.data.accessors or [])
+        gltf.supercell_mesh_accessors = {}
+        gltf.supercell_native_mesh = None
         primitives: List[MeshPrimitive] = pymesh.primitives or []
+
+        mesh_info_indices = [self.get_mesh_info_index(primitive) for primitive in primitives]
+        if (self.properties.native_meshes and can_build_mesh(primitives, mesh_info_indices)):
+            # Importer skips primitives without positions, so it only creates empty mesh with material slots
+            # and the mesh itself is built later in after hook
+            gltf.supercell_native_mesh = SupercellMeshOptions(
+                skin_idx,
+                getattr(mesh_options, "skinning", True),
+                getattr(mesh_options, "skin_into_bind_pose", True),
+                gltf.import_settings.get('merge_vertices', False)
+            )
+
+            for primitive, mesh_info_idx in zip(primitives, mesh_info_indices):
+                gltf.supercell_mesh_accessors.setdefault(mesh_info_idx, {})
+
+                # Importer picks material variant by presence of vertex colors, placeholder is never read since there is no positions
+                has_colors = "COLOR_0" in gltf.supercell_vertex_cache.acquire(mesh_info_idx)
+                primitive.attributes = {"COLOR_0": None} if has_colors else {}
+            return
+
         for primitive in primitives:
             self.decode_primitive(gltf, primitive)
 
+    def gather_import_mesh_after_hook(self, pymesh: Mesh, blender_mesh: bpy.types.Mesh, gltf: glTFImporter):
+        if (not self.valid_gltf(gltf)):
+            return
+
+        options: SupercellMeshOptions = gltf.supercell_native_mesh
+        if (options is not None):
+            primitives: List[MeshPrimitive] = pymesh.primitives or []
+            mesh_info_indices = [self.get_mesh_info_index(primitive) for primitive in primitives]
+            mesh_infos = {idx: gltf.supercell_vertex_cache.acquire(idx) for idx in set(mesh_info_indices)}
+
+            build_mesh(gltf, primitives, mesh_info_indices, mesh_infos, blender_mesh, options)
+            gltf.supercell_native_mesh = None
+
+        self.release_mesh_infos(gltf)
+
     def gather_import_material_before_hook(self, gltf_material: Material, vertex_color, gltf: glTFImporter):
         if (not self.valid_gltf(gltf)):
             return
@@ -280,6 +547,10 @@ class glTF2ImportUserExtension:
         if (descriptor is None):
             return
         
+        # Material may be created for several vertex color variants, descriptor is parsed only once
+        if (isinstance(descriptor, ScShaderMaterial)):
+            return
+        
         material = ScShaderMaterial()
         material.from_dict(gltf, descriptor)
         extensions[glTF_material_extension_name] = material
@@ -294,6 +565,21 @@ class glTF2ImportUserExtension:
         if (material is None):
             return
         
+        # Identical material may be already built in this import or earlier in session
+        content_hash = None
+        if (self.properties.deduplicate_materials):
+            # Same relative texture paths may point to different images in different directories
+            textures: TextureRegistry = gltf.supercell_textures
+            content_hash = material.content_hash(
+                self.properties.shader_preset,
+                texture_resolver=lambda prop: os.path.abspath(path) if (path := textures.find_file(prop.texture_path)) else None
+            )
+            existing = self.find_material(gltf, content_hash)
+            if (existing is not None and existing != blender_mat):
+                gltf_material.blender_material[vertex_color] = existing.name
+                bpy.data.materials.remove(blender_mat)
+                return
+
         preset = None
         match(self.properties.shader_preset):
             case ShaderPresetType.UNLIT:
@@ -313,17 +599,42 @@ class glTF2ImportUserExtension:
         tree = blender_mat.node_tree
         tree.nodes.clear()
         
-        preset_instance = preset(material, blender_mat)
+        preset_instance = preset(material, blender_mat, gltf.supercell_textures)
         
         # Selected preset creation
         preset_instance.create_material()
         
         # Marking shader as valid SupercellIO shader
         preset_instance.shader["$SupercellIO"] = self.properties.shader_preset
+
+        if (content_hash is not None):
+            blender_mat[MATERIAL_HASH_PROPERTY] = content_hash
+            gltf.supercell_materials[content_hash] = blender_mat.name
+
+    def find_material(self, gltf: glTFImporter, content_hash: str) -> bpy.types.Material | None:
+        """Finds already built material with the same content"""
+        if (gltf.supercell_materials is None):
+            # Materials from previous imports of current session
+            gltf.supercell_materials = {
+                material[MATERIAL_HASH_PROPERTY]: material.name for material in bpy.data.materials
+                if MATERIAL_HASH_PROPERTY in material
+            }
+
+        name = gltf.supercell_materials.get(content_hash)
+        if (name is None):
+            return None
+
+        # Material could be removed or changed by user
+        material = bpy.data.materials.get(name)
+        if (material is None or material.get(MATERIAL_HASH_PROPERTY) != content_hash):
+            del gltf.supercell_materials[content_hash]
+            return None
+
+        return material
         
     def gather_import_scene_after_nodes_hook(self, gltf_scene, blender_scene: bpy.types.Scene, gltf):
         if (not self.valid_gltf(gltf)):
             return
         
         if (self.properties.adjust_colorspace):
-            blender_scene.view_settings.view_transform = "Raw"
\ No newline at end of file
+            blender_scene.view_settings.view_transform = "Raw"
@@ -1,16 +1,62 @@
+import bpy
+import mmap
 import struct
 from io_scene_gltf2.io.imp.gltf2_io_gltf import glTFImporter
+from io_scene_gltf2.io.com.gltf2_io import gltf_from_dict
 from ..com.flatbuffer import deserialize_glb_json
 import sys
 import types
 
 TARGET_MODULE = "io_scene_gltf2.io.imp.gltf2_io_gltf"
 TARGET_CLASS = "glTFImporter"
-TARGET_METHOD = "load_glb"
 
+# Original methods of importer class, filled on patching
+original_methods = {}
 
-def load_glb(self: glTFImporter, content: bytes):
+
+def use_memory_map() -> bool:
+    properties = getattr(bpy.context.scene, "glTFSupercellImporterProperties", None)
+    return properties is not None and properties.memory_mapped
+
+
+def validate_chunks(content: memoryview, offset: int):
+    """Checks that chunk table fits into file without reading any chunk data"""
+    file_size = len(content)
+    while offset < file_size:
+        if offset + 8 > file_size:
+            raise ImportError("Bad GLB: truncated chunk header")
+
+        length, = struct.unpack_from('<I', content, offset=offset)
+        offset += 8 + length
+        if offset > file_size:
+            raise ImportError("Bad GLB: chunk length exceeds file size")
+
+
+def read(self: glTFImporter):
+    """Read file. Binary files can be mapped into memory instead of being fully loaded"""
+    if not use_memory_map():
+        return original_methods["read"](self)
+
+    with open(self.filename, 'rb') as f:
+        if f.read(4) != b'glTF':
+            return original_methods["read"](self)
+
+        # All chunks are sliced from this mapping, so it will be kept alive as long as the glb buffer exists
+        content = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    json_, self.glb_buffer = self.load_glb(content)
+
+    try:
+        self.data = gltf_from_dict(json_)
+    except AssertionError:
+        import traceback
+        traceback.print_exc()
+        raise ImportError("Couldn't parse glTF. Check that the file is valid")
+
+
+def load_glb(self: glTFImporter, content: bytes | memoryview):
     """Load binary glb."""
+    content = memoryview(content)
     magic = content[:4]
     if magic != b'glTF':
         raise ImportError("This file is not a glTF/glb file")
@@ -23,8 +69,10 @@ def load_glb(self: glTFImporter, content: bytes):
 
     glb_buffer = None
     offset = 12  # header size = 12
+    validate_chunks(content, offset)
 
     # JSON/FLAT chunk is first
+    # Chunks are memoryview slices of content, so there is no data copying
     name, length, data, offset = self.load_chunk(content, offset)
     if (name == b'FLA2'):
         gltf = deserialize_glb_json(data)
@@ -44,6 +92,12 @@ def load_glb(self: glTFImporter, content: bytes):
     return gltf, glb_buffer
 
 
+# Patched methods of importer class
+TARGET_METHODS = {
+    "load_glb": load_glb,
+    "read": read
+}
+
 if TARGET_MODULE not in sys.modules:
     fake_module = types.ModuleType(TARGET_MODULE)
     sys.modules[TARGET_MODULE] = fake_module
@@ -54,6 +108,8 @@ def patch_importer():
         mod = __import__(TARGET_MODULE, fromlist=[TARGET_CLASS])
         cls = getattr(mod, TARGET_CLASS)
 
-        setattr(cls, TARGET_METHOD, load_glb)
+        for method, function in TARGET_METHODS.items():
+            original_methods.setdefault(method, getattr(cls, method))
+            setattr(cls, method, function)
     except Exception as e:
         print(f"[SC IO] Failed to patch: {e}")
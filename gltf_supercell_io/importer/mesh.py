@@ -0,0 +1,244 @@
+import bpy
+import numpy as np
+
+from io_scene_gltf2.io.imp.gltf2_io_gltf import glTFImporter
+from io_scene_gltf2.io.com.gltf2_io import MeshPrimitive
+from io_scene_gltf2.io.imp.gltf2_io_binary import BinaryData
+from io_scene_gltf2.blender.imp.mesh import skin_into_bind_pose, locs_yup_to_zup, uvs_gltf_to_blender, normalize_in_place
+
+from ..com.odin.mesh import weld_vertices
+
+from typing import List
+
+
+class SupercellMeshOptions:
+    """Part of importer mesh options which is used by mesh builder"""
+
+    def __init__(self, skin_idx: int | None, skinning: bool = True, skin_into_bind_pose: bool = True, merge_vertices: bool = False):
+        self.skin_idx = skin_idx
+        self.skinning = skinning
+        self.skin_into_bind_pose = skin_into_bind_pose
+        self.merge_vertices = merge_vertices
+
+
+def can_build_mesh(primitives: List[MeshPrimitive], mesh_info_indices: List[int | None]) -> bool:
+    """Only indexed triangle lists made entirely from Odin vertex streams are built directly"""
+    if (not primitives):
+        return False
+
+    for primitive, mesh_info_idx in zip(primitives, mesh_info_indices):
+        if (mesh_info_idx is None or primitive.indices is None):
+            return False
+
+        if (primitive.mode is not None and primitive.mode != 4):
+            return False
+
+    return True
+
+
+def gather_vertices(gltf: glTFImporter, primitives: List[MeshPrimitive], mesh_info_indices: List[int], mesh_infos: dict[int, dict[str, np.ndarray]]) -> tuple[dict[str, np.ndarray], list[np.ndarray]]:
+    """
+    Collects vertices used by primitives. Primitives with the same mesh data info share their vertices
+
+    :return: Vertex attributes by glTF names and triangles of every primitive
+    """
+    # Primitives grouped by mesh data info, in order of first appearance
+    groups: dict[int, list[int]] = {}
+    for i, mesh_info_idx in enumerate(mesh_info_indices):
+        groups.setdefault(mesh_info_idx, []).append(i)
+
+    indices = [BinaryData.decode_accessor(gltf, primitive.indices).reshape(-1) for primitive in primitives]
+
+    chunks: dict[str, list[np.ndarray]] = {}
+    triangles: list[np.ndarray | None] = [None] * len(primitives)
+    vertex_count = 0
+    for mesh_info_idx, members in groups.items():
+        used, inverse = np.unique(np.concatenate([indices[i] for i in members]), return_inverse=True)
+        inverse = inverse.reshape(-1).astype(np.int32) + vertex_count
+
+        offset = 0
+        for i in members:
+            count = len(indices[i]) - len(indices[i]) % 3
+            triangles[i] = inverse[offset:offset + count].reshape(-1, 3)
+            offset += len(indices[i])
+
+        for name, array in mesh_infos[mesh_info_idx].items():
+            # Attribute may be missing in some mesh data infos, previous vertices are filled with zeros then
+            if (name not in chunks):
+                chunks[name] = [np.zeros((vertex_count, array.shape[1]), dtype=array.dtype)] if vertex_count else []
+
+            chunks[name].append(array[used])
+
+        vertex_count += len(used)
+        for name, parts in chunks.items():
+            filled = sum(len(part) for part in parts)
+            if (filled < vertex_count):
+                parts.append(np.zeros((vertex_count - filled, parts[-1].shape[1]), dtype=parts[-1].dtype))
+
+    return {name: np.concatenate(parts) for name, parts in chunks.items()}, triangles
+
+
+def material_slots(gltf: glTFImporter, primitives: List[MeshPrimitive], vertex_colors: List[str | None], mesh: bpy.types.Mesh) -> list[int]:
+    """
+    Material slot of every primitive. Slots are created by importer, here they are only looked up.
+    Material variant is chosen by vertex color the same way importer does
+    """
+    slots = []
+    for primitive, vertex_color in zip(primitives, vertex_colors):
+        if (primitive.material is None):
+            slot = next((i for i, material in enumerate(mesh.materials) if material is None), None)
+            if (slot is None):
+                mesh.materials.append(None)
+                slot = len(mesh.materials) - 1
+            slots.append(slot)
+            continue
+
+        pymaterial = gltf.data.materials[primitive.material]
+        name = pymaterial.blender_material.get(vertex_color)
+        slot = mesh.materials.find(name) if name is not None else -1
+        slots.append(max(slot, 0))
+
+    return slots
+
+
+def create_geometry(mesh: bpy.types.Mesh, positions: np.ndarray, triangles: np.ndarray):
+    """Creates vertices and triangles with bulk foreach_set calls, edges are calculated by Blender"""
+    face_count = len(triangles)
+
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", positions.reshape(-1))
+
+    mesh.loops.add(face_count * 3)
+    mesh.loops.foreach_set("vertex_index", triangles.reshape(-1).astype(np.int32))
+
+    # Size of every face is defined by start of next one
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, face_count * 3, 3, dtype=np.int32))
+
+    mesh.update(calc_edges=True)
+
+
+def create_uvs(mesh: bpy.types.Mesh, vertices: dict[str, np.ndarray], loops: np.ndarray):
+    uv_idx = 0
+    while f"TEXCOORD_{uv_idx}" in vertices:
+        uvs = vertices[f"TEXCOORD_{uv_idx}"][loops].astype(np.float32)
+        uvs_gltf_to_blender(uvs)
+
+        layer = mesh.uv_layers.new(name="UVMap" if uv_idx == 0 else f"UVMap.{uv_idx:03d}")
+        layer.data.foreach_set("uv", uvs.reshape(-1))
+        uv_idx += 1
+
+
+def create_colors(mesh: bpy.types.Mesh, vertices: dict[str, np.ndarray]):
+    """Colors are stored per vertex in byte color attributes, they are expanded to floats only while being written"""
+    color_idx = 0
+    while f"COLOR_{color_idx}" in vertices:
+        colors = vertices[f"COLOR_{color_idx}"]
+        if (colors.shape[1] == 3):
+            colors = np.concatenate([colors, np.full((len(colors), 1), 255, dtype=colors.dtype)], axis=1)
+
+        values = colors.astype(np.float32).reshape(-1)
+        if (np.issubdtype(colors.dtype, np.integer)):
+            values /= np.iinfo(colors.dtype).max
+
+        attribute = mesh.color_attributes.new("Color" if color_idx == 0 else f"Color.{color_idx:03d}", 'BYTE_COLOR', 'POINT')
+        attribute.data.foreach_set("color", values)
+        color_idx += 1
+
+
+# Skin weights are written with this precision, it is finer than precision of packed Odin weights
+WEIGHT_LEVELS = 65535
+
+
+def create_vertex_groups(object: bpy.types.Object, names: list[str], joints: np.ndarray, weights: np.ndarray):
+    """
+    Writes skin weights to vertex groups straight from compact joint indices. Groups are named by bones, so Armature modifier can find them.
+    Vertex group takes single weight per call, so vertices of every joint are added in runs with the same quantized weight.
+    Count of calls depends on count of distinct weights of joint and not on count of vertices
+    """
+    groups = [object.vertex_groups.new(name=name) for name in names]
+
+    vertices = np.repeat(np.arange(len(joints), dtype=np.int64), joints.shape[1])
+    joints = joints.reshape(-1).astype(np.int64)
+    levels = np.rint(weights.reshape(-1) * WEIGHT_LEVELS).astype(np.int64)
+
+    mask = (levels > 0) & (joints < len(groups))
+    vertices, joints, levels = vertices[mask], joints[mask], levels[mask]
+
+    order = np.lexsort((vertices, levels, joints))
+    vertices, joints, levels = vertices[order], joints[order], levels[order]
+
+    starts = np.flatnonzero(np.r_[True, (joints[1:] != joints[:-1]) | (levels[1:] != levels[:-1])])
+    ends = np.r_[starts[1:], len(joints)]
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        groups[joints[start]].add(vertices[start:end].tolist(), levels[start] / WEIGHT_LEVELS, 'REPLACE')
+
+
+def build_mesh(gltf: glTFImporter, primitives: List[MeshPrimitive], mesh_info_indices: List[int], mesh_infos: dict[int, dict[str, np.ndarray]], mesh: bpy.types.Mesh, options: SupercellMeshOptions):
+    """Builds Blender mesh from decoded Odin vertex streams"""
+    vertices, triangles = gather_vertices(gltf, primitives, mesh_info_indices, mesh_infos)
+
+    faces = np.concatenate(triangles) if triangles else np.zeros((0, 3), dtype=np.int32)
+    vertex_colors = ["COLOR_0" if "COLOR_0" in mesh_infos[idx] else None for idx in mesh_info_indices]
+    slots = material_slots(gltf, primitives, vertex_colors, mesh)
+    material_indices = np.repeat(np.array(slots, dtype=np.int32), [len(tris) for tris in triangles])
+
+    # Texture coordinates are stored per face corner, so they are taken from vertices before welding
+    corners = faces
+
+    if (options.merge_vertices):
+        point_names = [name for name in vertices if not name.startswith("TEXCOORD_")]
+        kept, remap = weld_vertices({name: vertices[name] for name in point_names})
+        faces = remap[faces].astype(np.int32)
+        for name in point_names:
+            vertices[name] = vertices[name][kept]
+
+    # Degenerate triangles are not valid Blender faces
+    valid = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+    if (not valid.all()):
+        faces, corners, material_indices = faces[valid], corners[valid], material_indices[valid]
+
+    positions = vertices["POSITION"].astype(np.float32)
+    normals = vertices["NORMAL"].astype(np.float32) if "NORMAL" in vertices else None
+    if (normals is not None):
+        normalize_in_place(normals)
+
+    if (gltf.yup2zup):
+        locs_yup_to_zup(positions)
+        if (normals is not None):
+            locs_yup_to_zup(normals)
+
+    skinned = options.skin_idx is not None and options.skinning and "JOINTS_0" in vertices and "WEIGHTS_0" in vertices
+    if (skinned and options.skin_into_bind_pose):
+        skin_into_bind_pose(
+            gltf, options.skin_idx, [vertices["JOINTS_0"]], [vertices["WEIGHTS_0"]],
+            locs=[positions],
+            vert_normals=normals if normals is not None else []
+        )
+
+    create_geometry(mesh, positions, faces)
+
+    create_uvs(mesh, vertices, corners.reshape(-1))
+    create_colors(mesh, vertices)
+
+    if (len(mesh.materials)):
+        mesh.polygons.foreach_set("material_index", material_indices)
+
+    if (normals is not None):
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(faces), dtype=bool))
+        mesh.normals_split_custom_set_from_vertices(normals)
+
+    if (skinned):
+        # Same names as importer gives to vertex groups of its meshes
+        pyskin = gltf.data.skins[options.skin_idx]
+        bone_names = [gltf.vnodes[joint].blender_bone_name for joint in pyskin.joints or []]
+
+        # Vertex groups are stored in mesh, but can only be created through object
+        object = bpy.data.objects.new("##gltf-import:tmp-object##", mesh)
+        try:
+            create_vertex_groups(object, bone_names, vertices["JOINTS_0"], vertices["WEIGHTS_0"])
+        finally:
+            bpy.data.objects.remove(object)
+
+    mesh.update()
+
@@ -1,6 +1,6 @@
 import bpy
 from bpy.types import UILayout, Context, PropertyGroup
-from bpy.props import BoolProperty, EnumProperty
+from bpy.props import BoolProperty, EnumProperty, IntProperty
 from ..com.shader.builder import ShaderPresetType
 from ..com import glTF_extension_name
 
@@ -30,6 +30,38 @@ class glTFSupercellImporterProperties(PropertyGroup):
         description='Configures color space required for correct display of SC shaders',
         default=True
     )
+    
+    prune_unused: BoolProperty(
+        description='Skips meshes, materials, skins and images which are not used by scene nodes. Unused skins are not imported as armatures',
+        default=False
+    )
+    
+    decode_streams: BoolProperty(
+        description='Decodes Odin vertex streams into regular arrays once per mesh data instead of reading them vertex by vertex',
+        default=True
+    )
+    
+    native_meshes: BoolProperty(
+        description='Builds Supercell meshes directly from decoded vertex streams with bulk data writes instead of generic glTF mesh import. Vertex colors and skin joints are kept compact',
+        default=False
+    )
+    
+    decode_threads: IntProperty(
+        description='Count of threads used to decode vertex streams of all meshes in advance, 0 uses all CPU cores. '
+                    'Faster, but decoded data of whole file is kept in memory at once. 1 decodes meshes one by one on demand and keeps only meshes in use',
+        default=1,
+        min=0
+    )
+    
+    deduplicate_materials: BoolProperty(
+        description='Reuses already built material instead of creating identical one. Materials that differ only by name are considered identical',
+        default=False
+    )
+    
+    memory_mapped: BoolProperty(
+        description='Maps GLB files into memory instead of reading them whole. Reduces memory usage on big files',
+        default=False
+    )
 
 def draw_import(context: Context, layout: UILayout):
     header, body = layout.panel(glTF_extension_name, default_closed=False)
@@ -42,3 +74,9 @@ def draw_import(context: Context, layout: UILayout):
         body.prop(props, 'single_skeleton', text="Import as single skeleton")
         body.prop(props, 'better_settings', text="Use custom glTF importer settings")
         body.prop(props, 'adjust_colorspace', text="Adjust color space")
+        body.prop(props, 'deduplicate_materials', text="Merge identical materials")
+        body.prop(props, 'prune_unused', text="Skip unused data")
+        body.prop(props, 'decode_streams', text="Decode vertex streams")
+        body.prop(props, 'native_meshes', text="Build meshes directly")
+        body.prop(props, 'decode_threads', text="Decode threads")
+        body.prop(props, 'memory_mapped', text="Memory-map files")